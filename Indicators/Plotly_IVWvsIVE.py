@@ -1,4 +1,4 @@
-import yfinance as yf
+from providers import get_provider
 import pandas as pd
 import plotly.graph_objects as go
 
@@ -8,7 +8,7 @@ tickers = ['IVW', 'IVE']
 all_tickers = [baseline] + tickers
 
 # Fetch adjusted closing prices in 5 yera window
-data = yf.download(all_tickers, period='5y', auto_adjust=True, progress=False)['Close']
+data = get_provider().download(all_tickers, period='5y')['Close']
 
 # Calculate Rolling 1-Year (252 Trading Days) Return
 # We use 252 as it represents the number of trading days in 365 calendar days
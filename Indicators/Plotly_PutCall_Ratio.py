@@ -1,4 +1,4 @@
-import yfinance as yf
+from providers import get_provider
 import pandas as pd
 from datetime import datetime
 import plotly.graph_objects as go
@@ -6,8 +6,8 @@ import plotly.graph_objects as go
 # Define ticker and timeframe
   # find option chains in the 14 nearest expiration dates
   # reserve dictionary for Put/Call ratio across different chains
-sp500 = yf.Ticker('SPY')
-option_dates = sp500.options[:14]
+provider = get_provider()
+option_dates = provider.option_expirations('SPY')[:14]
 put_call_ratios_by_date = {}
 put_call_OI_ratios_by_date = {}
 
@@ -15,7 +15,7 @@ put_call_OI_ratios_by_date = {}
   # obtain call and put volume of each expiration
   # calculate Put/Call ratio by dividing volume and OI of Puts by Calls
 for date in option_dates:
-    opt_chain_by_date = sp500.option_chain(date=date)
+    opt_chain_by_date = provider.option_chain('SPY', date)
 
     calls_by_date = opt_chain_by_date.calls
     puts_by_date = opt_chain_by_date.puts
@@ -1,4 +1,4 @@
-import yfinance as yf
+from providers import get_provider
 import pandas as pd
 import datetime
 import plotly.graph_objects as go
@@ -11,7 +11,7 @@ start_date = end_date - datetime.timedelta(days=365 + 250)
 
 # Fetch SPY data from yfinance
   # skips weekends and holidays
-df = yf.download('SPY', start=start_date, end=end_date, auto_adjust=True, progress=False)['Close']
+df = get_provider().download('SPY', start=start_date, end=end_date)['Close']
 df = df.dropna()
 
 # Calculate 125-day moving average
@@ -1,11 +1,11 @@
-import yfinance as yf
+from providers import get_provider
 import plotly.graph_objects as go
 
 # Define tickers and timeframe
   # fetch adjusted closing prices for both tickers
   # yfinance defaults auto_adjust=True that define closeing prices as 'Close'
 tickers = ['SPY', 'IEF']
-data = yf.download(tickers, period='12mo', auto_adjust=True, progress=False) ['Close']
+data = get_provider().download(tickers, period='12mo')['Close']
 
 # Calculate 20-Day Rolling Returns (Percentage Change)
 returns_20d = data.pct_change(20).dropna()
@@ -1,4 +1,4 @@
-import yfinance as yf
+from providers import get_provider
 import pandas as pd
 import datetime
 import plotly.graph_objects as go
@@ -12,7 +12,7 @@ start_date = end_date - datetime.timedelta(days=365 + 100)
 # Fetch data from yfinance
   # 'VIX' is the ticker for CBOE Volatility Index in yfinance
   # skips weekends and holidays
-vix_data = yf.download('^VIX', start=start_date, end=end_date, auto_adjust=True, progress=False)
+vix_data = get_provider().download('^VIX', start=start_date, end=end_date)
 df = vix_data[['Close']].copy()
 df.columns = ['VIX']
 
@@ -1,15 +1,15 @@
-import yfinance as yf
+from providers import get_provider
 import pandas as pd
 import plotly.graph_objects as go
 from datetime import datetime
 
 # Find current price of SPY
 ticker_symbol = "SPY"
-spy = yf.Ticker(ticker_symbol)
-current_price = spy.history(period="1d")['Close'].iloc[-1]
+provider = get_provider()
+current_price = provider.last_price(ticker_symbol)
 
 # Get the nearest 10 expiration dates
-expirations = spy.options[:10]  # Take the first 10 expirations
+expirations = provider.option_expirations(ticker_symbol)[:10]  # Take the first 10 expirations
 
 all_calls_data = []  # To store (calls_df, expiry_date) tuples
 all_puts_data = []   # To store (puts_df, expiry_date) tuples
@@ -28,7 +28,7 @@ for expiry_date in expirations:
     dte = (expiry_datetime - today).days
 
     # Fetch option chain for each expiration date
-    opt = spy.option_chain(expiry_date)
+    opt = provider.option_chain(ticker_symbol, expiry_date)
     calls = opt.calls
     puts = opt.puts
 
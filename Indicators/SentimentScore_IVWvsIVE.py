@@ -1,42 +1,23 @@
-import yfinance as yf
-import pandas as pd
-
-# Define tickers and timeframe
-baseline = 'SPY'
-tickers = ['IVW', 'IVE']
-all_tickers = [baseline] + tickers
-
-# Fetch adjusted closing prices in 5 yera window
-data = yf.download(all_tickers, period='5y', auto_adjust=True, progress=False)['Close']
-
-# Calculate Rolling 1-Year (252 Trading Days) Return
-# We use 252 as it represents the number of trading days in 365 calendar days
-rolling_window = 252
-rolling_returns = data.pct_change(periods=rolling_window)
-
-# Calculate Percentage Deviation from SPY
-# Deviation = (Ticker_Return - SPY_Return) * 100
-deviations = pd.DataFrame()
-for ticker in tickers:
-    deviations[f'{ticker}_dev'] = (rolling_returns[ticker] - rolling_returns[baseline]) * 100
-
-df = deviations.dropna().copy()
-
-df['Diff'] = df['IVW_dev'] - df['IVE_dev']
-
-# Find percentile rank of difference in 1 year window
-df['Score'] = df['Diff'].rolling(window=252).rank(pct=True) * 100
-
-# Define the sentiment score
-def get_sentiment(Score):
-    if Score >= 90: return "Extreme Greed"
-    if Score >= 70: return "Greed"
-    if Score >= 40: return "Neutral"
-    if Score >= 20: return "Fear"
-    return "Extreme Fear"
-
-# Add Sentiment column to df BEFORE defining 'latest'
-df['Sentiment'] = df['Score'].apply(get_sentiment)
+from providers import get_provider
+from indicator_engine import get_indicator, history_start
+import datetime
+
+# Use the dashboard's Growth vs Value indicator
+  # rolling 1-year (252 trading days) return of IVW and IVE relative to SPY,
+  # difference ranked in a 252-day window
+indicator = get_indicator('gv')
+
+# Define timeframe
+  # set today as end date
+  # set 3 years PLUS the indicator's warm-up as start date
+end_date = datetime.datetime.now()
+start_date = history_start([indicator], 3 * 365, end_date)
+
+# Fetch adjusted closing prices
+closes = get_provider().download(indicator.tickers, start=start_date, end=end_date)['Close']
+
+# Deviation = (Ticker_Return - SPY_Return) * 100, then Diff = IVW_dev - IVE_dev
+df = indicator.compute(closes).dropna(subset=['Score'])
 
 print(f"Date: {df.index[-1].date()}")
 
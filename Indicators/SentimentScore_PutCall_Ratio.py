@@ -1,18 +1,18 @@
-import yfinance as yf
+from providers import get_provider
 import pandas as pd
 import plotly.graph_objects as go
 
 # Define ticker and timeframe
   # find option chains in the 14 nearest expiration dates
-sp500 = yf.Ticker('SPY')
-option_dates = sp500.options[:14]
+provider = get_provider()
+option_dates = provider.option_expirations('SPY')[:14]
 results = []
 
 # Loop to find Put/Call ratio across all chains
   # calculate Put/Call ratio by dividing volume and OI of Puts by Calls
   # assign quadrant based on Put/Call ratios
 for date in option_dates:
-    opt = sp500.option_chain(date)
+    opt = provider.option_chain('SPY', date)
     
     v_pcr = opt.puts['volume'].sum() / opt.calls['volume'].sum()
     oi_pcr = opt.puts['openInterest'].sum() / opt.calls['openInterest'].sum()
@@ -1,38 +1,27 @@
-import yfinance as yf
+from providers import get_provider
+from indicator_engine import get_indicator, history_start
 import datetime
 
-# Define tickers and timeframe
-  # fetch adjusted closing prices for both tickers
-  # yfinance defaults auto_adjust=True that define closeing prices as 'Close'
-tickers = ['SPY', 'IEF']
-data = yf.download(tickers, period='12mo', auto_adjust=True, progress=False) ['Close']
+# Use the dashboard's Safe Haven Demand indicator
+  # 20-day return spread of stocks (SPY) minus bonds (IEF), ranked in a 252-day window
+indicator = get_indicator('sh')
 
-# Calculate 20-Day Rolling Returns (Percentage Change)
-returns_20d = data.pct_change(20).dropna()
+# Define timeframe
+  # set today as end date
+  # set 1 year PLUS the indicator's warm-up as start date
+end_date = datetime.datetime.now()
+start_date = history_start([indicator], 365, end_date)
 
-# Calculate the spread
-  # "Stocks return minus bonds return"
-returns_20d['Spread'] = returns_20d['SPY'] - returns_20d['IEF']
+# Fetch adjusted closing prices for both tickers
+closes = get_provider().download(indicator.tickers, start=start_date, end=end_date)['Close']
 
-# Define the sentiment score
-def get_sentiment(spread):
-    if spread <= -0.02:
-        return "Extreme Fear"
-    elif spread <= 0.015:
-        return "Fear"
-    elif spread <= 0.02:
-        return "Neutral"
-    elif spread <= 0.05:
-        return "Greed"
-    else:
-        return "Extreme Greed"
+# Compute the spread, percentile score and sentiment
+df = indicator.compute(closes).dropna(subset=['Score'])
+latest = df.iloc[-1]
 
-plot_data = returns_20d.dropna().copy()
-plot_data['Sentiment'] = plot_data['Spread'].apply(get_sentiment)
-latest = plot_data.iloc[-1]
-
-print(f"Date: {plot_data.index[-1].date()}")
+print(f"Date: {df.index[-1].date()}")
 print(f"SPY 20d Return: {latest['SPY']:.4f}")
 print(f"IEF 20d Return: {latest['IEF']:.4f}")
 print(f"Return Spread:   {latest['Spread']:.4f}")
+print(f"Score (0-100):   {latest['Score']:.2f}")
 print(f"Sentiment:       {latest['Sentiment']}")
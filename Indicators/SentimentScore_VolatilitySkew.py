@@ -1,14 +1,14 @@
-import yfinance as yf
+from providers import get_provider
 import numpy as np
 import pandas as pd
 
 # Find current price of SPY
 ticker_symbol = "SPY"
-spy = yf.Ticker(ticker_symbol)
-current_price = spy.history(period="1d")['Close'].iloc[-1]
+provider = get_provider()
+current_price = provider.last_price(ticker_symbol)
 
 # Get the nearest 10 expiration dates
-expirations = spy.options[:10]
+expirations = provider.option_expirations(ticker_symbol)[:10]
 
 # Set parameters for option data
   # 1% at-the-money window
@@ -21,7 +21,7 @@ results = []
 
 # Process each expiration
 for expiry_date in expirations:
-    opt = spy.option_chain(expiry_date)
+    opt = provider.option_chain(ticker_symbol, expiry_date)
     calls = opt.calls.copy()
     puts = opt.puts.copy()
 
@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from indicator_engine import label_scores
+from pipeline import overall_threshold
+from episodes import transition_durations
+
+# Synthetic 30-year aggregate score: a mean-reverting walk in 0-100 with a few missing days
+N_DAYS = 252 * 30
+
+rng = np.random.default_rng(0)
+score = np.empty(N_DAYS)
+score[0] = 50
+for i in range(1, N_DAYS):
+    score[i] = np.clip(score[i - 1] + 0.05 * (50 - score[i - 1]) + rng.normal(0, 6), 0, 100)
+score[rng.random(N_DAYS) < 0.002] = np.nan
+index = pd.bdate_range('1995-01-02', periods=N_DAYS, name='Date')
+df = pd.DataFrame({'overall_average_sentiment': score}, index=index)
+
+
+def loop_recovery(df):
+    # Previous per-entry scan: df.loc[start:] and a boolean filter for every Extreme Fear entry
+    is_extreme_fear = df['overall_average_sentiment'] < 25
+    ef_entries = df.index[is_extreme_fear & (~is_extreme_fear.shift(1, fill_value=False))]
+    durations = []
+    for start_date in ef_entries:
+        future_data = df.loc[start_date:]
+        recovery_event = future_data[future_data['overall_average_sentiment'] >= 45]
+        if not recovery_event.empty:
+            durations.append((recovery_event.index[0] - start_date).days)
+    return np.array(durations, dtype=np.int64)
+
+
+start = time.perf_counter()
+expected = loop_recovery(df)
+t_loop = time.perf_counter() - start
+
+start = time.perf_counter()
+labels = label_scores(score, overall_threshold)
+pair = transition_durations(labels, index, pairs=[('Extreme Fear', 'Neutral')])
+t_pair = time.perf_counter() - start
+
+start = time.perf_counter()
+transitions = transition_durations(labels, index)
+t_all = time.perf_counter() - start
+
+assert np.array_equal(expected, pair['Days'].to_numpy())
+selected = (transitions['From'] == 'Extreme Fear') & (transitions['To'] == 'Neutral')
+assert np.array_equal(expected, transitions.loc[selected, 'Days'].to_numpy())
+print("Episode durations identical to the per-entry loop: OK")
+
+print(f"{len(expected)} Extreme Fear -> Neutral episodes over {N_DAYS} days: "
+      f"loop {t_loop * 1000:.0f} ms, episode engine {t_pair * 1000:.1f} ms")
+print(f"All {len(transitions)} episodes of the 20 (from, to) pairs: {t_all * 1000:.1f} ms")
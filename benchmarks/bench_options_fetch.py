@@ -0,0 +1,47 @@
+import os
+import sys
+import random
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from options_fetcher import fetch_option_chains
+
+# Stub chain provider with injected latency
+  # every call sleeps LATENCY +- JITTER seconds
+  # one expiry in FAIL_EVERY times out on its first attempt
+N_EXPIRIES = 14
+LATENCY = 0.25
+JITTER = 0.10
+SLOW_LATENCY = 5.0
+FAIL_EVERY = 7
+
+random.seed(0)
+attempts = {}
+
+def stub_option_chain(date):
+    attempts[date] = attempts.get(date, 0) + 1
+    if date % FAIL_EVERY == 0 and attempts[date] == 1:
+        time.sleep(SLOW_LATENCY)
+    else:
+        time.sleep(LATENCY + random.uniform(-JITTER, JITTER))
+    return SimpleNamespace(calls=f'calls-{date}', puts=f'puts-{date}')
+
+dates = list(range(N_EXPIRIES))
+
+# Sequential baseline (the loop previously used in data_loader.get_options_data)
+attempts.clear()
+start = time.perf_counter()
+sequential = [stub_option_chain(date) for date in dates]
+t_seq = time.perf_counter() - start
+
+# Concurrent fetcher with a 1-second timeout so the slow first attempts get retried
+attempts.clear()
+start = time.perf_counter()
+chains = fetch_option_chains(stub_option_chain, dates, max_workers=8, timeout=1.0, retries=2, backoff=0.1)
+t_con = time.perf_counter() - start
+
+print(f"Expirations: {N_EXPIRIES}, latency: {LATENCY:.2f}s +- {JITTER:.2f}s, slow first attempt every {FAIL_EVERY}")
+print(f"Sequential: {t_seq:.2f}s ({len(sequential)} chains)")
+print(f"Concurrent: {t_con:.2f}s ({len(chains)} chains)")
+print(f"Speed-up:   {t_seq / t_con:.1f}x")
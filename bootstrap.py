@@ -0,0 +1,112 @@
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pipeline import HORIZONS, LABEL_ORDER, forward_return_matrix
+
+# ==========================================
+# Block Bootstrap of Regime-Conditional Returns
+# ==========================================
+  # forward returns over overlapping windows are strongly autocorrelated, so resamples are drawn as
+  # blocks of consecutive days (one horizon long) rather than single days; a resample is only an
+  # integer index array into the return matrix, the series itself is never copied
+  # resamples are split into fixed-size chunks, each with its own child seed, and spread over a
+  # process pool: results depend on SEED and the budget only, not on the number of workers
+N_RESAMPLES = int(os.environ.get('BOOTSTRAP_RESAMPLES', 1000))
+MAX_WORKERS = int(os.environ.get('BOOTSTRAP_WORKERS', os.cpu_count() or 1))
+SEED = 20240101
+CHUNK_SIZE = 50             # Resamples per pool task
+CONFIDENCE = 0.95
+STATISTICS = ['mean', 'median']
+
+
+def block_indices(rng, n, block_length, n_resamples):
+    """(n_resamples, n) day indices built from random blocks of `block_length` consecutive days."""
+    block_length = min(block_length, n)
+    n_blocks = -(-n // block_length)
+    starts = rng.integers(0, n - block_length + 1, size=(n_resamples, n_blocks))
+    return (starts[:, :, None] + np.arange(block_length)).reshape(n_resamples, -1)[:, :n]
+
+
+def regime_statistics(returns, codes):
+    """Mean and median of each column of `returns` (resamples x days) per label code: shape (resamples, labels, 2)."""
+    out = np.full((len(returns), len(LABEL_ORDER), len(STATISTICS)), np.nan)
+    valid = ~np.isnan(returns)
+    for code in range(len(LABEL_ORDER)):
+        in_regime = valid & (codes == code)
+        count = in_regime.sum(axis=1)
+        values = np.where(in_regime, returns, np.nan)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out[:, code, 0] = np.where(in_regime, returns, 0).sum(axis=1) / count
+        has = count > 0
+        out[has, code, 1] = np.nanmedian(values[has], axis=1)
+    return out
+
+
+# --- Pool Workers ---
+_inputs = {}
+
+def _init_worker(inputs):
+    _inputs.update(inputs)
+
+def _resample_chunk(task):
+    # Statistics of `size` resamples for every horizon: shape (horizons, size, labels, 2)
+    seed, size = task
+    rng = np.random.default_rng(seed)
+    forward, codes = _inputs['forward'], _inputs['codes']
+    chunk = []
+    for j, period in enumerate(_inputs['block_lengths']):
+        idx = block_indices(rng, len(codes), period, size)
+        chunk.append(regime_statistics(forward[idx, j], codes[idx]))
+    return np.stack(chunk)
+
+
+# --- Bootstrap ---
+
+def bootstrap_key(combined_sentiment_df, close, n_resamples=N_RESAMPLES, horizons=HORIZONS):
+    """Fingerprint of the inputs and settings, to reuse a previous snapshot's results when nothing changed."""
+    digest = hashlib.sha1()
+    digest.update(combined_sentiment_df['overall_label'].cat.codes.to_numpy().tobytes())
+    digest.update(np.asarray(close, dtype=np.float64).tobytes())
+    digest.update(repr((n_resamples, SEED, CHUNK_SIZE, CONFIDENCE, sorted(horizons.items()))).encode())
+    return digest.hexdigest()
+
+
+def regime_bootstrap(combined_sentiment_df, close, n_resamples=N_RESAMPLES, horizons=HORIZONS, max_workers=MAX_WORKERS):
+    """Differences in mean and median forward return between every pair of sentiment labels, per horizon.
+
+    Returns one row per (Horizon, Regime, Versus, Statistic) with the observed difference (Regime minus
+    Versus), its block-bootstrap confidence interval and a two-sided p-value for no difference.
+    """
+    codes = combined_sentiment_df['overall_label'].cat.codes.to_numpy()
+    periods = list(horizons.values())
+    forward = forward_return_matrix(close, periods)
+    inputs = {'forward': forward, 'codes': codes, 'block_lengths': periods}
+
+    # Child seeds per chunk: the same budget always draws the same resamples
+    sizes = [min(CHUNK_SIZE, n_resamples - start) for start in range(0, n_resamples, CHUNK_SIZE)]
+    seeds = np.random.SeedSequence(SEED).spawn(len(sizes))
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(inputs,)) as pool:
+        resampled = np.concatenate(list(pool.map(_resample_chunk, zip(seeds, sizes))), axis=1)
+
+    observed = np.stack([regime_statistics(forward[None, :, j], codes[None, :])[0] for j in range(len(periods))])
+    alpha = (1 - CONFIDENCE) / 2
+    rows = []
+    for j, horizon in enumerate(horizons):
+        for a in range(len(LABEL_ORDER)):
+            for b in range(a + 1, len(LABEL_ORDER)):
+                for s, statistic in enumerate(STATISTICS):
+                    diff = observed[j, a, s] - observed[j, b, s]
+                    draws = resampled[j, :, a, s] - resampled[j, :, b, s]
+                    draws = draws[~np.isnan(draws)]
+                    if np.isnan(diff) or not len(draws):
+                        continue
+                    low, high = np.quantile(draws, [alpha, 1 - alpha])
+                    # Share of draws at least as far from the observed difference as the observed is from 0
+                    p_value = np.mean(np.abs(draws - diff) >= abs(diff))
+                    rows.append({'Horizon': horizon, 'Regime': LABEL_ORDER[a], 'Versus': LABEL_ORDER[b],
+                                 'Statistic': statistic, 'Difference': diff, 'CI Low': low, 'CI High': high,
+                                 'p-value': p_value, 'Resamples': len(draws)})
+    return pd.DataFrame(rows, columns=['Horizon', 'Regime', 'Versus', 'Statistic', 'Difference',
+                                       'CI Low', 'CI High', 'p-value', 'Resamples'])
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+# Compact option chain table
+  # one row per contract across every expiration, only the columns the dashboard reads
+OPTION_TYPES = pd.CategoricalDtype(['call', 'put'])
+
+CHAIN_SCHEMA = {
+    'strike': ('strike', np.float32),
+    'iv': ('impliedVolatility', np.float32),
+    'volume': ('volume', np.int32),
+    'oi': ('openInterest', np.int32),
+    'bid': ('bid', np.float32),
+    'ask': ('ask', np.float32),
+}
+
+
+def build_chain_table(chains, spot=None, band=None):
+    """Flattens [{'date', 'calls', 'puts'}] chains into one table with expiry/type codes and 32-bit columns.
+
+    With `spot` and `band` set, contracts with |strike / spot - 1| > band are dropped at ingest.
+    """
+    parts = [(entry['date'], kind, entry[f'{kind}s']) for entry in chains for kind in ('call', 'put')]
+    sizes = [len(df) for _, _, df in parts]
+    dates = [entry['date'] for entry in chains]
+
+    columns = {
+        # int16 codes so long expiry lists don't wrap; pandas still stores int8 codes below 128 expirations
+        'expiry': pd.Categorical.from_codes(
+            np.repeat(np.arange(len(parts)) // 2, sizes).astype(np.int16), categories=dates),
+        'type': pd.Categorical.from_codes(
+            np.repeat(np.arange(len(parts)) % 2, sizes).astype(np.int8), dtype=OPTION_TYPES),
+    }
+    for name, (source, dtype) in CHAIN_SCHEMA.items():
+        values = np.concatenate([df[source].to_numpy(dtype=np.float64, na_value=np.nan) for _, _, df in parts]) \
+            if parts else np.empty(0)
+        if np.issubdtype(dtype, np.integer):
+            # Missing volume / OI means no contracts traded
+            values = np.nan_to_num(values, nan=0.0)
+        columns[name] = values.astype(dtype)
+
+    table = pd.DataFrame(columns)
+    if spot is not None and band is not None:
+        moneyness = table['strike'].to_numpy() / spot
+        table = table[np.abs(moneyness - 1) <= band].reset_index(drop=True)
+    return table
@@ -1,43 +1,88 @@
-import streamlit as st
-import yfinance as yf
-import pandas as pd
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from price_store import load_panel
+from options_fetcher import fetch_option_chains, fetch_concurrently, MAX_RETRIES
+from chain_table import build_chain_table
+from implied_vol import chain_implied_vol
+from providers import get_provider
+from swr_cache import swr_cache
+from pipeline import run_pipeline
+from indicator_engine import required_tickers
+from snapshot import latest_version, load_snapshot
+from options_archive import load_options_history
 
 # TTL is set to 7200 seconds (2 hours)
-CACHE_TIME = 7200 
-
-@st.cache_data(ttl=CACHE_TIME)
-def get_spy_data():
-    # Fetches SPY historical data
-    return yf.download('SPY', period='10y', auto_adjust=True, progress=False)
-
-@st.cache_data(ttl=CACHE_TIME)
-def get_vix_data():
-    # Fetches VIX historical data
-    return yf.download('^VIX', period='10y', auto_adjust=True, progress=False)
-
-@st.cache_data(ttl=CACHE_TIME)
-def get_sh_data():
-    # Fetches SPY and IEF for Safe Haven Demand
-    return yf.download(['SPY', 'IEF'], period='10y', auto_adjust=True, progress=False)['Close']
-
-@st.cache_data(ttl=CACHE_TIME)
-def get_gv_data():
-    # Fetches SPY, IVW, and IVE for Growth vs Value analysis
-    return yf.download(['SPY', 'IVW', 'IVE'], period='10y', auto_adjust=True, progress=False)['Close']
-
-@st.cache_data(ttl=CACHE_TIME)
-def get_options_data(ticker_symbol='SPY'):
-    # Fetches option chains for the nearest 14 expirations
-    ticker = yf.Ticker(ticker_symbol)
-    dates = ticker.options[:14]
-    chains = []
-    for date in dates:
-        opt = ticker.option_chain(date)
-        chains.append({
-            'date': date,
-            'calls': opt.calls,
-            'puts': opt.puts
-        })
-    # Also return current price to avoid extra calls in main
-    current_price = ticker.history(period="1d")['Close'].iloc[-1]
-    return chains, current_price
+CACHE_TIME = 7200
+
+# Worker snapshots older than this are ignored and the page computes live instead
+SNAPSHOT_MAX_AGE = 4 * 24 * 3600
+
+# Optional +-band around spot kept when option chains are ingested (None keeps every strike)
+MONEYNESS_BAND = None
+
+# Union of tickers needed by every registered indicator, fetched together
+PANEL_TICKERS = required_tickers()
+
+def fetch_price_panel():
+    # One aligned (Price, Ticker) panel with every ticker, uncached
+    return load_panel(PANEL_TICKERS)
+
+def fetch_options_data(ticker_symbol='SPY'):
+    # Fetches option chains for the nearest 14 expirations in parallel, uncached
+    # Returned as one compact table (see chain_table.build_chain_table) plus the spot price
+    provider = get_provider()
+    dates = provider.option_expirations(ticker_symbol)[:14]
+    # Also return current price to avoid extra calls in main, fetched alongside the chains
+      # with the same timeout / retry handling as the chain requests
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        price_future = pool.submit(fetch_concurrently, provider.last_price, [ticker_symbol])
+        chains = fetch_option_chains(partial(provider.option_chain, ticker_symbol), dates)
+        current_price, = price_future.result()
+    if current_price is None:
+        raise RuntimeError(f"No price for {ticker_symbol} after {MAX_RETRIES + 1} attempts")
+    table = build_chain_table(chains, current_price, MONEYNESS_BAND)
+    # Implied volatility solved from the bid/ask mids (see implied_vol.py) replaces the provider's column,
+    # except for contracts without a usable quote (e.g. market closed), which keep the provider's value
+    solved = chain_implied_vol(table, current_price)
+    table['iv'] = np.where(np.isfinite(solved), solved, table['iv'].to_numpy())
+    return table, current_price
+
+def build_snapshot(panel, option_data, frames=None):
+    # Full pipeline run on already fetched inputs, plus the PCR / skew history rebuilt from the options archive
+    results = run_pipeline(panel['Close'], *option_data, frames=frames)
+    results['options_history'] = load_options_history('SPY')
+    return results
+
+@swr_cache(ttl=CACHE_TIME)
+def get_live_snapshot():
+    # Fallback when no worker snapshot is available: computed once per refresh, not per rerun
+    # Inputs fetched directly, not through nested caches (the refresh already runs off-thread), so its status age is the data's
+    return build_snapshot(fetch_price_panel(), fetch_options_data('SPY'))
+
+_worker_snapshot = {}
+
+def _load_worker_snapshot():
+    version = latest_version()
+    if version is None:
+        return None
+    if version not in _worker_snapshot:
+        _worker_snapshot.clear()
+        _worker_snapshot[version] = load_snapshot(version)
+    snapshot = _worker_snapshot[version]
+    if time.time() - snapshot['created_at'] > SNAPSHOT_MAX_AGE:
+        return None
+    return snapshot
+
+def get_snapshot():
+    # Ready-to-render results: the worker's latest snapshot, else a live computation
+    return _load_worker_snapshot() or get_live_snapshot()
+
+def get_data_status():
+    # Age and refresh state of the rendered snapshot, for the page's "as of" caption
+    snapshot = _load_worker_snapshot()
+    if snapshot is not None:
+        age = time.time() - snapshot['created_at']
+        return {'updated_at': snapshot['created_at'], 'age': age, 'refreshing': False, 'last_error': None}
+    return get_live_snapshot.status()
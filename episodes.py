@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+from indicator_engine import SENTIMENT_DTYPE
+
+# Sentiment episode engine
+  # an episode starts on the first day of a run of one label (run-length encoding of the label codes)
+  # and ends on the first later day the label reaches the target state, found with one reverse
+  # "next index where code >= k / <= k" scan per state, so every (from, to) pair costs O(n)
+STATES = list(SENTIMENT_DTYPE.categories)   # Fear to greed, in code order
+
+
+def label_runs(codes):
+    """Run-length encoding of label codes: start position, length and code of every run (NaN, code -1, included)."""
+    codes = np.asarray(codes)
+    starts = np.flatnonzero(np.r_[len(codes) > 0, codes[1:] != codes[:-1]])
+    lengths = np.diff(np.r_[starts, len(codes)])
+    return starts, lengths, codes[starts]
+
+
+def next_reach(codes):
+    """First position at or after each day whose code is >= k (up[k]) or <= k (down[k]); len(codes) if never."""
+    n = len(codes)
+    positions = np.arange(n)
+    labeled = codes >= 0
+
+    def scan(hit):
+        # Running minimum of the hit positions, from the end backwards
+        return np.minimum.accumulate(np.where(hit, positions, n)[::-1])[::-1]
+
+    up = {k: scan(labeled & (codes >= k)) for k in range(1, len(STATES))}
+    down = {k: scan(labeled & (codes <= k)) for k in range(len(STATES) - 1)}
+    return up, down
+
+
+def transition_durations(labels, dates, pairs=None):
+    """Calendar days from every entry into a state until the label first reaches another state.
+
+    Reaching a state means getting at least that far in its direction: Extreme Fear -> Neutral ends on the
+    first day labeled Neutral, Greed or Extreme Greed. `pairs` of (from, to) labels default to every pair.
+    Returns one row per recovered episode: From, To (SENTIMENT_DTYPE), Entry date and Days.
+    """
+    codes = np.asarray(pd.Categorical(labels, dtype=SENTIMENT_DTYPE).codes)
+    dates = pd.DatetimeIndex(dates)
+    if pairs is None:
+        pairs = [(s, t) for s in STATES for t in STATES if s != t]
+
+    starts, _, values = label_runs(codes)
+    up, down = next_reach(codes)
+    from_codes, to_codes, entries, exits = [], [], [], []
+    for s, t in pairs:
+        s, t = STATES.index(s), STATES.index(t)
+        entry = starts[values == s]
+        reach = (up[t] if t > s else down[t])[entry]
+        recovered = reach < len(codes)
+        entries.append(entry[recovered])
+        exits.append(reach[recovered])
+        from_codes.append(np.full(recovered.sum(), s, dtype=np.int8))
+        to_codes.append(np.full(recovered.sum(), t, dtype=np.int8))
+
+    entries = np.concatenate(entries) if entries else np.array([], dtype=np.int64)
+    exits = np.concatenate(exits) if exits else np.array([], dtype=np.int64)
+    return pd.DataFrame({
+        'From': pd.Categorical.from_codes(np.concatenate(from_codes) if from_codes else [], dtype=SENTIMENT_DTYPE),
+        'To': pd.Categorical.from_codes(np.concatenate(to_codes) if to_codes else [], dtype=SENTIMENT_DTYPE),
+        'Entry': dates[entries],
+        'Days': np.asarray((dates[exits] - dates[entries]).days, dtype=np.int64),
+    })
+
+
+def duration_matrix(durations, stat='median'):
+    """`stat` of the episode durations for every (From, To) pair: From states as rows, To states as columns."""
+    matrix = durations.pivot_table(index='From', columns='To', values='Days', aggfunc=stat, observed=False)
+    return matrix.reindex(index=STATES, columns=STATES)
@@ -0,0 +1,70 @@
+import warnings
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from indicator_engine import SENTIMENT_DTYPE
+from episodes import label_runs
+
+# Event study around sentiment extremes
+  # every entry into Extreme Fear / Extreme Greed (the label thresholds of the recovery analysis) is an event;
+  # price paths from BEFORE days before to AFTER days after are read from one strided view over the
+  # NaN-padded price panel, so the only copy is the final gather of the event windows
+EVENTS = ['Extreme Fear', 'Extreme Greed']
+TICKERS = ['SPY', '^VIX', 'IEF']
+BEFORE, AFTER = 20, 60          # Trading days around the entry
+QUANTILES = [0.1, 0.25, 0.5, 0.75, 0.9]
+SKIP_OVERLAPS = True            # Drop entries inside the post-event window of the previous kept event
+
+
+def event_positions(labels, event, after=AFTER, skip_overlaps=SKIP_OVERLAPS):
+    """Positions of the days the label enters `event`; re-entries within `after` days of a kept one are dropped if skip_overlaps."""
+    codes = np.asarray(pd.Categorical(labels, dtype=SENTIMENT_DTYPE).codes)
+    starts, _, values = label_runs(codes)
+    entries = starts[values == list(SENTIMENT_DTYPE.categories).index(event)]
+    if not skip_overlaps:
+        return entries
+    kept, last = [], None
+    for position in entries:
+        if last is None or position - last > after:
+            kept.append(position)
+            last = position
+    return np.array(kept, dtype=np.int64)
+
+
+def event_windows(prices, positions, before=BEFORE, after=AFTER):
+    """(events, tickers, before + after + 1) prices around each position; NaN where a window runs past either edge."""
+    prices = np.asarray(prices, dtype=np.float64)
+    padded = np.concatenate([np.full((before, prices.shape[1]), np.nan), prices,
+                             np.full((after, prices.shape[1]), np.nan)])
+    # windows[t] covers days t - before .. t + after of the original panel, without copying it
+    windows = sliding_window_view(padded, before + after + 1, axis=0)
+    return windows[positions]
+
+
+def event_study(labels, closes, events=EVENTS, tickers=TICKERS, before=BEFORE, after=AFTER, skip_overlaps=SKIP_OVERLAPS):
+    """Mean, quantiles and event count per (event, ticker, offset) of the % change from the close on the entry day."""
+    prices = closes[tickers].reindex(labels.index)
+    offsets = np.arange(-before, after + 1)
+    frames = []
+    for event in events:
+        positions = event_positions(labels, event, after, skip_overlaps)
+        if not len(positions):
+            continue
+        windows = event_windows(prices.to_numpy(), positions, before, after)
+        # % path relative to the entry day
+        with np.errstate(invalid='ignore', divide='ignore'):
+            paths = (windows / windows[:, :, before:before + 1] - 1) * 100
+        # One reduction over the event axis for every ticker and offset; offsets past the edges for all events stay NaN
+        with warnings.catch_warnings(), np.errstate(invalid='ignore'):
+            warnings.simplefilter('ignore', RuntimeWarning)
+            quantiles = np.nanquantile(paths, QUANTILES, axis=0)
+            count = (~np.isnan(paths)).sum(axis=0)
+            mean = np.nansum(paths, axis=0) / count
+        for i, ticker in enumerate(tickers):
+            frame = pd.DataFrame({'Event': event, 'Ticker': ticker, 'Offset': offsets, 'mean': mean[i]})
+            for q, values in zip(QUANTILES, quantiles):
+                frame[f'q{round(q * 100)}'] = values[i]
+            frame['count'] = count[i]
+            frames.append(frame)
+    columns = ['Event', 'Ticker', 'Offset', 'mean'] + [f'q{round(q * 100)}' for q in QUANTILES] + ['count']
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
@@ -0,0 +1,111 @@
+import os
+import numpy as np
+import pandas as pd
+from datetime import date
+from scipy.special import ndtr
+
+# Black-Scholes implied volatility solved from bid/ask mid prices
+  # every contract of every expiration is solved at once: safeguarded Newton iterations on NumPy arrays,
+  # each contract keeps a [low, high] bracket of volatilities and falls back to bisection whenever the
+  # Newton step leaves it (flat vega far from the money), so every quote inside the no-arbitrage bounds converges
+RISK_FREE_RATE = float(os.environ.get('RISK_FREE_RATE', 0.04))     # Continuously compounded, annual
+DIVIDEND_YIELD = float(os.environ.get('DIVIDEND_YIELD', 0.013))    # Continuous dividend yield of the underlying
+SIGMA_MIN, SIGMA_MAX = 1e-4, 5.0    # Initial bracket of every solve
+PRICE_TOL = 1e-6                    # Absolute price error at which a contract counts as solved
+SIGMA_TOL = 1e-8                    # Bracket width at which a contract counts as solved
+MAX_ITER = 100
+MIN_DAYS = 0.5                      # Time to expiry floor in days, so same-day expirations stay solvable
+
+SQRT_2PI = np.sqrt(2 * np.pi)
+
+
+def bs_price_vega(spot, strike, t, sigma, is_call, rate=RISK_FREE_RATE, dividend_yield=DIVIDEND_YIELD):
+    """Black-Scholes-Merton price and vega (per unit of volatility) of European calls / puts, element-wise."""
+    sqrt_t = np.sqrt(t)
+    forward = spot * np.exp(-dividend_yield * t)    # Discounted forward
+    discounted = strike * np.exp(-rate * t)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1 = (np.log(forward / discounted) + 0.5 * sigma ** 2 * t) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    price = np.where(is_call, forward * ndtr(d1) - discounted * ndtr(d2),
+                     discounted * ndtr(-d2) - forward * ndtr(-d1))
+    vega = forward * np.exp(-0.5 * d1 ** 2) / SQRT_2PI * sqrt_t
+    return price, vega
+
+
+def bs_gamma(spot, strike, t, sigma, rate=RISK_FREE_RATE, dividend_yield=DIVIDEND_YIELD):
+    """Black-Scholes-Merton gamma (the same for calls and puts), element-wise; NaN where sigma or t is not positive."""
+    sqrt_t = np.sqrt(t)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1 = (np.log(spot / strike) + (rate - dividend_yield + 0.5 * sigma ** 2) * t) / (sigma * sqrt_t)
+        gamma = np.exp(-dividend_yield * t - 0.5 * d1 ** 2) / (SQRT_2PI * spot * sigma * sqrt_t)
+    return np.where((sigma > 0) & (t > 0), gamma, np.nan)
+
+
+def implied_volatility(price, spot, strike, t, is_call, rate=RISK_FREE_RATE, dividend_yield=DIVIDEND_YIELD,
+                       max_iter=MAX_ITER):
+    """Implied volatility of every price, element-wise; NaN outside the no-arbitrage bounds or without convergence."""
+    price, spot, strike, t, is_call = np.broadcast_arrays(
+        np.asarray(price, dtype=np.float64), np.asarray(spot, dtype=np.float64),
+        np.asarray(strike, dtype=np.float64), np.asarray(t, dtype=np.float64), np.asarray(is_call, dtype=bool))
+    shape = price.shape
+    price, spot, strike, t, is_call = (a.ravel() for a in (price, spot, strike, t, is_call))
+
+    # A price below intrinsic value or above the underlying (calls) / the strike (puts) has no volatility
+    forward = spot * np.exp(-dividend_yield * t)
+    discounted = strike * np.exp(-rate * t)
+    lower = np.maximum(np.where(is_call, forward - discounted, discounted - forward), 0)
+    upper = np.where(is_call, forward, discounted)
+    with np.errstate(invalid='ignore'):
+        valid = np.isfinite(price) & (t > 0) & (strike > 0) & (price > lower) & (price < upper)
+
+    sigma = np.full(len(price), np.nan)
+    # Solve only the contracts still open; each iteration works on the shrinking active subset
+    active = np.flatnonzero(valid)
+    low = np.full(len(active), SIGMA_MIN)
+    high = np.full(len(active), SIGMA_MAX)
+    # Brenner-Subrahmanyam starting point, clipped into the bracket
+    guess = np.clip(price[active] / forward[active] * SQRT_2PI / np.sqrt(t[active]), 0.05, 1.0)
+    for _ in range(max_iter):
+        if not len(active):
+            break
+        model, vega = bs_price_vega(spot[active], strike[active], t[active], guess, is_call[active],
+                                    rate, dividend_yield)
+        diff = model - price[active]
+        # Price rises with volatility: the guess becomes the new upper or lower end of the bracket
+        high = np.where(diff > 0, guess, high)
+        low = np.where(diff < 0, guess, low)
+        done = (np.abs(diff) < PRICE_TOL) | (high - low < SIGMA_TOL)
+        sigma[active[done]] = guess[done]
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            step = guess - diff / vega
+        # Bisect where Newton leaves the bracket (or vega vanished)
+        step = np.where((step > low) & (step < high), step, 0.5 * (low + high))
+        keep = ~done
+        active, low, high, guess = active[keep], low[keep], high[keep], step[keep]
+    return sigma.reshape(shape)
+
+
+def expiry_years(expiries, today=None):
+    """Time to each 'YYYY-MM-DD' expiration in years of 365 calendar days from `today`, at least MIN_DAYS."""
+    days = (pd.to_datetime(expiries) - pd.Timestamp(today or date.today())).days.to_numpy()
+    return np.maximum(days, MIN_DAYS) / 365
+
+
+def chain_implied_vol(option_chain, spot, rate=RISK_FREE_RATE, dividend_yield=DIVIDEND_YIELD, today=None):
+    """Implied volatility of every contract of a chain table (see chain_table.py) from its bid/ask mid.
+
+    Contracts without a usable quote (ask > 0, 0 <= bid <= ask) or with a mid outside the no-arbitrage
+    bounds are NaN. Time to expiry is counted in calendar days from `today` (default: the current date).
+    """
+    bid = option_chain['bid'].to_numpy(dtype=np.float64)
+    ask = option_chain['ask'].to_numpy(dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        mid = np.where((ask > 0) & (bid >= 0) & (bid <= ask), (bid + ask) / 2, np.nan)
+
+    expiry = option_chain['expiry'].cat
+    t = expiry_years(expiry.categories, today)[expiry.codes.to_numpy()]
+    is_call = (option_chain['type'] == 'call').to_numpy()
+    iv = implied_volatility(mid, spot, option_chain['strike'].to_numpy(), t, is_call, rate, dividend_yield)
+    return iv.astype(np.float32)
@@ -0,0 +1,563 @@
+import bisect
+import datetime
+from abc import ABC, abstractmethod
+from collections import deque
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from rolling_rank import rolling_rank
+
+# ==========================================
+# Indicator Engine
+# ==========================================
+  # every sentiment indicator is an Indicator subclass registered in REGISTRY
+  # an indicator declares its tickers, parameters, warm-up and thresholds,
+  # and turns a frame of closing prices into its score frame with NumPy,
+  # or extends it one bar at a time from serializable rolling state (IndicatorStream)
+
+THRESHOLD_VALUE = ["Extreme Greed","Greed","Neutral","Fear","Extreme Fear"]
+
+# Labels as an ordered categorical, from fear to greed: one int8 code per row, NaN for warm-up rows
+SENTIMENT_DTYPE = pd.CategoricalDtype(THRESHOLD_VALUE[::-1], ordered=True)
+
+def get_sentiment_label(s, threshold):
+    """Categorizes the 0-100 average into a sentiment string (NaN stays NaN)."""
+    if np.isnan(s): return np.nan
+    for i in range(4):
+        if s >= threshold[i]: return THRESHOLD_VALUE[i]
+    return THRESHOLD_VALUE[-1]
+
+def label_scores(scores, threshold):
+    """Vectorized get_sentiment_label: maps an array of scores to a SENTIMENT_DTYPE Categorical."""
+    scores = np.asarray(scores, dtype=np.float64)
+    # Number of cut-offs at or below the score = position in the fear-to-greed order
+    codes = np.searchsorted(np.sort(threshold), scores, side='right').astype(np.int8)
+    codes[np.isnan(scores)] = -1
+    return pd.Categorical.from_codes(codes, dtype=SENTIMENT_DTYPE)
+
+# --- Array Kernels ---
+
+def rolling_mean(x, window):
+    # NaN until the window is full, or while it contains a NaN
+    out = np.full(len(x), np.nan)
+    if len(x) >= window:
+        out[window - 1:] = sliding_window_view(x, window).mean(axis=1)
+    return out
+
+def pct_change(x, periods):
+    out = np.full(len(x), np.nan)
+    out[periods:] = x[periods:] / x[:-periods] - 1
+    return out
+
+# --- Streaming State ---
+  # one-bar-at-a-time counterparts of the kernels above, giving bit-identical values
+
+class RollingMean:
+    """Mean of the last `window` pushes.
+
+    Each push re-averages the whole window, O(window), instead of keeping a running sum: repeating the batch
+    kernel's reduction keeps streamed values bit-identical to compute(), where a running sum differs in the
+    last bits on most bars (and can move ties in the rank). About 20-40 us per push at the 50-365 bar windows used.
+    """
+
+    def __init__(self, window, values=()):
+        self.window = window
+        self.values = deque(values, maxlen=window)
+
+    def push(self, x):
+        self.values.append(x)
+        # Same reduction as sliding_window_view(...).mean(axis=1), so the result matches the batch kernel
+        return float(np.mean(np.array(self.values))) if len(self.values) == self.window else np.nan
+
+    def to_state(self):
+        return {'window': self.window, 'values': list(self.values)}
+
+
+class PctChange:
+    def __init__(self, periods, values=()):
+        self.periods = periods
+        self.values = deque(values, maxlen=periods + 1)
+
+    def push(self, x):
+        self.values.append(x)
+        if len(self.values) <= self.periods:
+            return np.nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return float(np.float64(x) / self.values[0] - 1)
+
+    def to_state(self):
+        return {'periods': self.periods, 'values': list(self.values)}
+
+
+class LogReturn:
+    def __init__(self, last=np.nan):
+        self.last = last
+
+    def push(self, x):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out = float(np.log(np.float64(x) / self.last))
+        self.last = x
+        return out
+
+    def to_state(self):
+        return {'last': self.last}
+
+
+class RollingStd:
+    def __init__(self, window, values=()):
+        self.window = window
+        self.values = deque(values, maxlen=window)
+
+    def push(self, x):
+        self.values.append(x)
+        # Sample standard deviation, as sliding_window_view(...).std(axis=1, ddof=1)
+        return float(np.std(np.array(self.values), ddof=1)) if len(self.values) == self.window else np.nan
+
+    def to_state(self):
+        return {'window': self.window, 'values': list(self.values)}
+
+
+class RollingRank:
+    """Percentile rank of each push among the non-NaN values of the last `window` pushes.
+
+    The window's values are kept in a sorted list: bisect finds the rank in O(log w), while inserting and
+    deleting are O(w) list moves, a single memmove of a few microseconds at these windows, so no tree is kept.
+    """
+
+    def __init__(self, window, values=()):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.ordered = []
+        for x in values:
+            self.push(x)
+
+    def push(self, x):
+        if len(self.values) == self.window:
+            old = self.values[0]
+            if not np.isnan(old):
+                del self.ordered[bisect.bisect_left(self.ordered, old)]
+        self.values.append(x)
+        if np.isnan(x):
+            return np.nan
+        bisect.insort(self.ordered, x)
+        nobs = len(self.ordered)
+        if nobs < self.window:
+            return np.nan
+        # Average rank of ties, as in rolling_rank.rolling_rank
+        less = bisect.bisect_left(self.ordered, x)
+        equal = bisect.bisect_right(self.ordered, x) - less
+        return (less + (equal + 1) / 2) / nobs
+
+    def to_state(self):
+        return {'window': self.window, 'values': list(self.values)}
+
+
+STATE_TYPES = {'mean': RollingMean, 'pct': PctChange, 'logret': LogReturn, 'std': RollingStd, 'rank': RollingRank}
+
+# --- Registry ---
+
+REGISTRY = {}
+
+def register(cls):
+    """Class decorator adding an indicator to the registry under its `name`."""
+    REGISTRY[cls.name] = cls
+    return cls
+
+def get_indicator(name, **overrides):
+    return REGISTRY[name](**overrides)
+
+def default_indicators():
+    return [cls() for cls in REGISTRY.values()]
+
+def required_tickers(indicators=None):
+    # Union of the indicators' tickers, in registration order
+    tickers = []
+    for indicator in indicators or default_indicators():
+        tickers += [t for t in indicator.tickers if t not in tickers]
+    return tickers
+
+def history_start(indicators, display_days, end=None):
+    """Earliest calendar date to fetch so every indicator has `display_days` of scores."""
+    warmup_bars = max(indicator.warmup for indicator in indicators)
+    # ~252 trading days per 365 calendar days, plus a margin for holidays
+    warmup_days = int(np.ceil(warmup_bars * 365 / 252)) + 10
+    return (end or datetime.datetime.now()) - datetime.timedelta(days=display_days + warmup_days)
+
+def compute_indicators(closes, indicators=None):
+    """Score frames of every indicator, keyed by name, from a frame of closes with one column per ticker."""
+    return {indicator.name: indicator.compute(closes) for indicator in indicators or default_indicators()}
+
+def indicator_from_state(state):
+    indicator = REGISTRY[state['name']](thresholds=state['thresholds'], **state['params'])
+    indicator.state = {key: STATE_TYPES[kind](**args) for key, (kind, args) in state['state'].items()}
+    return indicator
+
+
+class Indicator(ABC):
+    """A 0-100 sentiment score computed from the closing prices of `tickers`."""
+    name = None
+    title = None                # Display name
+    tickers = []
+    params = {}
+    thresholds = []             # Score cut-offs for Extreme Greed, Greed, Neutral and Fear
+    score_column = 'Score'
+    rank_column = 'Diff'        # Signal column ranked over `rank_window` into the score
+    state = None                # Rolling state used by update(), created on the first bar
+
+    def __init__(self, thresholds=None, **params):
+        unknown = set(params) - set(self.params)
+        if unknown:
+            raise ValueError(f"Unknown parameters for '{self.name}': {sorted(unknown)}")
+        self.params = {**self.params, **params}
+        if thresholds is not None:
+            self.thresholds = list(thresholds)
+
+    @property
+    @abstractmethod
+    def warmup(self):
+        """Bars of history consumed before the first score."""
+
+    @abstractmethod
+    def signal_arrays(self, prices):
+        """Returns (rows kept, {column: array}) up to rank_column from {ticker: close array}; rows is None to keep all."""
+
+    def score_arrays(self, percentile):
+        """Score columns from the 0-100 rolling percentile rank of rank_column."""
+        return {'Score': percentile}
+
+    def compute_arrays(self, prices):
+        rows, columns = self.signal_arrays(prices)
+        percentile = rolling_rank(columns[self.rank_column], self.params['rank_window']) * 100
+        return rows, {**columns, **self.score_arrays(percentile)}
+
+    @abstractmethod
+    def new_state(self):
+        """Fresh rolling state ({key: one of the STATE_TYPES}) for update()."""
+
+    @abstractmethod
+    def step(self, prices, state):
+        """One bar of compute_arrays(): {column: value} from {ticker: close}, or None if the bar is dropped."""
+
+    def label(self, score):
+        return get_sentiment_label(score, self.thresholds)
+
+    def update(self, prices):
+        """Adds one bar ({ticker: close}) and returns its row of the score frame, or None if it has no row."""
+        prices = {t: float(prices.get(t, np.nan)) for t in self.tickers}
+        if all(np.isnan(p) for p in prices.values()):
+            return None
+        if self.state is None:
+            self.state = self.new_state()
+        row = self.step(prices, self.state)
+        if row is not None:
+            row['Sentiment'] = self.label(row[self.score_column])
+        return row
+
+    def to_state(self):
+        kinds = {cls: kind for kind, cls in STATE_TYPES.items()}
+        return {
+            'name': self.name,
+            'params': self.params,
+            'thresholds': self.thresholds,
+            'state': {key: (kinds[type(s)], s.to_state()) for key, s in (self.state or {}).items()},
+        }
+
+    def price_arrays(self, closes):
+        """Dates with a close for any of the tickers, and {ticker: close array} on those dates."""
+        data = closes[self.tickers].dropna(how='all')
+        return data.index, {t: data[t].to_numpy(dtype=np.float64) for t in self.tickers}
+
+    def compute(self, closes):
+        index, prices = self.price_arrays(closes)
+        rows, columns = self.compute_arrays(prices)
+        index = index if rows is None else index[rows]
+        df = pd.DataFrame(columns, index=index)
+        df['Sentiment'] = label_scores(df[self.score_column].to_numpy(), self.thresholds)
+        return df
+
+
+@register
+class SPYTrend(Indicator):
+    # Tab1 Col1. S&P 500 Trend: SPY vs its moving average, ranked over a trailing window
+    name = 'spy'
+    title = 'S&P 500 Trend'
+    params = {'ticker': 'SPY', 'ma_window': 125, 'rank_window': 365}
+    thresholds = [76,56,45,25]
+
+    @property
+    def tickers(self):
+        return [self.params['ticker']]
+
+    @property
+    def warmup(self):
+        return self.params['ma_window'] - 1 + self.params['rank_window'] - 1
+
+    def signal_arrays(self, prices):
+        close = prices[self.params['ticker']]
+        ma = rolling_mean(close, self.params['ma_window'])
+        return None, {'Close': close, f"{self.params['ma_window']}MA": ma, 'Diff': close - ma}
+
+    def new_state(self):
+        return {'ma': RollingMean(self.params['ma_window']), 'rank': RollingRank(self.params['rank_window'])}
+
+    def step(self, prices, state):
+        close = prices[self.params['ticker']]
+        ma = state['ma'].push(close)
+        diff = close - ma
+        return {
+            'Close': close,
+            f"{self.params['ma_window']}MA": ma,
+            'Diff': diff,
+            'Score': state['rank'].push(diff) * 100,
+        }
+
+
+@register
+class VIXTrend(Indicator):
+    # Tab1 Col2. VIX Trend (Inverted): high VIX vs its moving average = fear = low score
+    name = 'vix'
+    title = 'VIX Trend'
+    tickers = ['^VIX']
+    params = {'ma_window': 50, 'rank_window': 252}
+    thresholds = [95,80,20,5]
+    score_column = 'Calculated_Score'
+
+    @property
+    def warmup(self):
+        return self.params['ma_window'] - 1 + self.params['rank_window'] - 1
+
+    def signal_arrays(self, prices):
+        close = prices['^VIX']
+        ma = rolling_mean(close, self.params['ma_window'])
+        return None, {'Close': close, f"{self.params['ma_window']}MA": ma, 'Diff': close - ma}
+
+    def score_arrays(self, percentile):
+        return {'Percentile': percentile, 'Calculated_Score': 100 - percentile}
+
+    def new_state(self):
+        return {'ma': RollingMean(self.params['ma_window']), 'rank': RollingRank(self.params['rank_window'])}
+
+    def step(self, prices, state):
+        close = prices['^VIX']
+        ma = state['ma'].push(close)
+        diff = close - ma
+        percentile = state['rank'].push(diff) * 100
+        return {
+            'Close': close,
+            f"{self.params['ma_window']}MA": ma,
+            'Diff': diff,
+            'Percentile': percentile,
+            'Calculated_Score': 100 - percentile,
+        }
+
+
+@register
+class SafeHavenDemand(Indicator):
+    # Tab2 Col1. Safe Haven Demand: stock minus bond returns, ranked over a trailing window
+    name = 'sh'
+    title = 'Safe Haven Demand'
+    params = {'ticker': 'SPY', 'bond': 'IEF', 'return_window': 20, 'rank_window': 252}
+    thresholds = [75,60,40,25]
+    rank_column = 'Spread'
+
+    @property
+    def tickers(self):
+        return [self.params['ticker'], self.params['bond']]
+
+    @property
+    def warmup(self):
+        return self.params['return_window'] + self.params['rank_window'] - 1
+
+    def signal_arrays(self, prices):
+        stock, bond = (pct_change(prices[t], self.params['return_window']) for t in self.tickers)
+        # Dates where either return is missing are dropped before ranking
+        rows = np.isfinite(stock) & np.isfinite(bond)
+        stock, bond = stock[rows], bond[rows]
+        return rows, {self.params['ticker']: stock, self.params['bond']: bond, 'Spread': stock - bond}
+
+    def new_state(self):
+        state = {t: PctChange(self.params['return_window']) for t in self.tickers}
+        state['rank'] = RollingRank(self.params['rank_window'])
+        return state
+
+    def step(self, prices, state):
+        stock, bond = (state[t].push(prices[t]) for t in self.tickers)
+        if not (np.isfinite(stock) and np.isfinite(bond)):
+            return None
+        spread = stock - bond
+        return {self.params['ticker']: stock, self.params['bond']: bond, 'Spread': spread,
+                'Score': state['rank'].push(spread) * 100}
+
+
+@register
+class GrowthValue(Indicator):
+    # Tab2 Col2. Growth vs Value: IVW minus IVE excess return over SPY, ranked over a trailing window
+    name = 'gv'
+    title = 'Growth vs Value'
+    tickers = ['SPY', 'IVW', 'IVE']
+    params = {'return_window': 252, 'rank_window': 252}
+    thresholds = [90,70,40,20]
+
+    @property
+    def warmup(self):
+        return self.params['return_window'] + self.params['rank_window'] - 1
+
+    def signal_arrays(self, prices):
+        returns = {t: pct_change(prices[t], self.params['return_window']) for t in self.tickers}
+        ivw_dev = (returns['IVW'] - returns['SPY']) * 100
+        ive_dev = (returns['IVE'] - returns['SPY']) * 100
+        return None, {'IVW_dev': ivw_dev, 'IVE_dev': ive_dev, 'Diff': ivw_dev - ive_dev}
+
+    def new_state(self):
+        state = {t: PctChange(self.params['return_window']) for t in self.tickers}
+        state['rank'] = RollingRank(self.params['rank_window'])
+        return state
+
+    def step(self, prices, state):
+        returns = {t: state[t].push(prices[t]) for t in self.tickers}
+        ivw_dev = (returns['IVW'] - returns['SPY']) * 100
+        ive_dev = (returns['IVE'] - returns['SPY']) * 100
+        diff = ivw_dev - ive_dev
+        return {'IVW_dev': ivw_dev, 'IVE_dev': ive_dev, 'Diff': diff, 'Score': state['rank'].push(diff) * 100}
+
+
+# --- Unregistered Indicators ---
+  # same methodology applied to tickers without a volatility index or style pair (see universe_engine.py)
+
+class RealizedVolTrend(Indicator):
+    # VIX Trend for any ticker: annualized realized volatility vs its moving average (Inverted)
+    name = 'realized_vol'
+    title = 'Realized Volatility Trend'
+    params = {'ticker': 'SPY', 'vol_window': 20, 'ma_window': 50, 'rank_window': 252}
+    thresholds = [95,80,20,5]
+    score_column = 'Calculated_Score'
+
+    @property
+    def tickers(self):
+        return [self.params['ticker']]
+
+    @property
+    def warmup(self):
+        return self.params['vol_window'] + self.params['ma_window'] - 1 + self.params['rank_window'] - 1
+
+    def signal_arrays(self, prices):
+        close = prices[self.params['ticker']]
+        log_returns = np.full(len(close), np.nan)
+        log_returns[1:] = np.log(close[1:] / close[:-1])
+        vol = np.full(len(close), np.nan)
+        window = self.params['vol_window']
+        if len(close) >= window:
+            vol[window - 1:] = sliding_window_view(log_returns, window).std(axis=1, ddof=1) * np.sqrt(252) * 100
+        ma = rolling_mean(vol, self.params['ma_window'])
+        return None, {'Volatility': vol, f"{self.params['ma_window']}MA": ma, 'Diff': vol - ma}
+
+    def score_arrays(self, percentile):
+        return {'Percentile': percentile, 'Calculated_Score': 100 - percentile}
+
+    def new_state(self):
+        return {'return': LogReturn(), 'vol': RollingStd(self.params['vol_window']),
+                'ma': RollingMean(self.params['ma_window']), 'rank': RollingRank(self.params['rank_window'])}
+
+    def step(self, prices, state):
+        vol = state['vol'].push(state['return'].push(prices[self.params['ticker']])) * np.sqrt(252) * 100
+        ma = state['ma'].push(vol)
+        diff = vol - ma
+        percentile = state['rank'].push(diff) * 100
+        return {
+            'Volatility': vol,
+            f"{self.params['ma_window']}MA": ma,
+            'Diff': diff,
+            'Percentile': percentile,
+            'Calculated_Score': 100 - percentile,
+        }
+
+
+class RelativeStrength(Indicator):
+    # Growth vs Value for any ticker: its excess return over a benchmark, ranked over a trailing window
+    name = 'relative_strength'
+    title = 'Relative Strength'
+    params = {'ticker': 'SPY', 'benchmark': 'SPY', 'return_window': 252, 'rank_window': 252}
+    thresholds = [90,70,40,20]
+    rank_column = 'Excess'
+
+    @property
+    def tickers(self):
+        return [self.params['ticker'], self.params['benchmark']]
+
+    @property
+    def warmup(self):
+        return self.params['return_window'] + self.params['rank_window'] - 1
+
+    def signal_arrays(self, prices):
+        ticker, benchmark = (pct_change(prices[t], self.params['return_window']) for t in self.tickers)
+        return None, {'Excess': (ticker - benchmark) * 100}
+
+    def new_state(self):
+        state = {t: PctChange(self.params['return_window']) for t in self.tickers}
+        state['rank'] = RollingRank(self.params['rank_window'])
+        return state
+
+    def step(self, prices, state):
+        ticker, benchmark = (state[t].push(prices[t]) for t in self.tickers)
+        excess = (ticker - benchmark) * 100
+        return {'Excess': excess, 'Score': state['rank'].push(excess) * 100}
+
+
+class IndicatorStream:
+    """Rolling state of a set of indicators: new bars extend their score frames without recomputing history."""
+
+    def __init__(self, indicators=None):
+        self.indicators = indicators or default_indicators()
+        self.last_date = None
+        self.last_closes = {}
+
+    def update(self, date, closes):
+        """Adds one bar ({ticker: close}) to every indicator; returns {name: row} for those with a row."""
+        rows = {}
+        for indicator in self.indicators:
+            row = indicator.update(closes)
+            if row is not None:
+                rows[indicator.name] = row
+        self.last_date = pd.Timestamp(date)
+        self.last_closes = {t: float(closes.get(t, np.nan)) for t in required_tickers(self.indicators)}
+        return rows
+
+    def extend(self, closes, frames=None):
+        """Feeds the bars of `closes` after the last one seen and returns the frames with their rows appended."""
+        new = closes if self.last_date is None else closes[closes.index > self.last_date]
+        records = {indicator.name: ([], []) for indicator in self.indicators}
+        for date, bar in zip(new.index, new.to_dict('records')):
+            for name, row in self.update(date, bar).items():
+                records[name][0].append(date)
+                records[name][1].append(row)
+
+        frames = dict(frames or {})
+        for name, (dates, rows) in records.items():
+            index = pd.DatetimeIndex(dates, name=closes.index.name)
+            added = pd.DataFrame(rows, index=index).astype({'Sentiment': SENTIMENT_DTYPE}) if rows else None
+            if name in frames and added is not None:
+                frames[name] = pd.concat([frames[name], added])
+            elif added is not None:
+                frames[name] = added
+        return frames
+
+    def is_consistent(self, closes):
+        # False once stored history changes under the state (e.g. a split-adjusted reload of the price store)
+        if self.last_date is None or self.last_date not in closes.index:
+            return False
+        bar = closes.loc[self.last_date]
+        return all(np.array_equal(bar.get(t, np.nan), v, equal_nan=True) for t, v in self.last_closes.items())
+
+    def to_state(self):
+        return {
+            'last_date': None if self.last_date is None else self.last_date.isoformat(),
+            'last_closes': self.last_closes,
+            'indicators': [indicator.to_state() for indicator in self.indicators],
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        stream = cls([indicator_from_state(s) for s in state['indicators']])
+        stream.last_date = None if state['last_date'] is None else pd.Timestamp(state['last_date'])
+        stream.last_closes = state['last_closes']
+        return stream
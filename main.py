@@ -1,16 +1,15 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import datetime
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from datetime import datetime as dt
-from data_loader import (
-    get_spy_data, get_vix_data, get_sh_data,
-    get_gv_data, get_options_data
-)
+from data_loader import get_snapshot, get_data_status
 import content
+from pipeline import HORIZONS, LABEL_ORDER, CORR_WINDOWS
+from episodes import duration_matrix
+from vol_surface import surface_summary, alert_levels
+from indicator_engine import default_indicators
 
 # ==========================================
 # Page Configuration
@@ -101,91 +100,24 @@ sentiment_legend_custom_text()
 # Current Aggregate Sentiment Calculation and Plotting
 # ==========================================
 
-# Sentiment label functions for individual indicators (also used in tabs)
-
-THRESHOLD_VALUE = ["Extreme Greed","Greed","Neutral","Fear","Extreme Fear"]
-
-overall_threshold = [76,56,45,25]
-spy_threshold = [76,56,45,25]
-vix_threshold = [95,80,20,5]
-sh_threshold = [75,60,40,25]
-gv_threshold = [90,70,40,20]
-
-def get_sentiment_label(s, threshold):
-    """Categorizes the 0-100 average into a sentiment string."""
-    for i in range(4):
-        if s >= threshold[i]: return THRESHOLD_VALUE[i]
-    return THRESHOLD_VALUE[-1]
-
-def get_overall_sentiment_string(s):
-    return get_sentiment_label(s, overall_threshold)
-
-def get_spy_sentiment_string(s):
-    return get_sentiment_label(s, spy_threshold)
-
-def get_vix_sentiment_string(s):
-    return get_sentiment_label(s, vix_threshold)
-
-def get_sh_sentiment_string(s):
-    return get_sentiment_label(s, sh_threshold)
-
-def get_gv_sentiment_string(s):
-    return get_sentiment_label(s, gv_threshold)
-
-# --- Data Fetching & Score Calculation ---
-
-# Tab1 Col1. S&P 500 Trend
-df_spy = get_spy_data()
-if isinstance(df_spy.columns, pd.MultiIndex):
-    df_spy.columns = df_spy.columns.get_level_values(0)
-df_spy['125MA'] = df_spy['Close'].rolling(window=125).mean()
-df_spy['Diff'] = df_spy['Close'] - df_spy['125MA']
-df_spy['Score'] = df_spy['Diff'].rolling(window=365).rank(pct=True) * 100
-df_spy['Sentiment'] = df_spy['Score'].apply(get_spy_sentiment_string)
-
-# Tab1 Col2. VIX Trend (Inverted)
-vix_data = get_vix_data()
-if isinstance(vix_data.columns, pd.MultiIndex):
-    vix_data.columns = vix_data.columns.get_level_values(0)
-vix_df = vix_data[['Close']].copy()
-vix_df['50MA'] = vix_df['Close'].rolling(window=50).mean()
-vix_df['Diff'] = vix_df['Close'] - vix_df['50MA']
-vix_df['Percentile'] = vix_df['Diff'].rolling(window=252).rank(pct=True) * 100
-vix_df['Calculated_Score'] = 100 - vix_df['Percentile']
-vix_df['Sentiment'] = vix_df['Calculated_Score'].apply(get_vix_sentiment_string)
-
-# Tab2 Col1. Safe Haven Demand
-sh_data = get_sh_data()
-if isinstance(sh_data.columns, pd.MultiIndex):
-    sh_data.columns = sh_data.columns.get_level_values(0)
-sh_returns = sh_data.pct_change(20).dropna()
-sh_returns['Spread'] = sh_returns['SPY'] - sh_returns['IEF']
-sh_returns['Score'] = sh_returns['Spread'].rolling(window=252).rank(pct=True) * 100
-sh_returns['Sentiment'] = sh_returns['Score'].apply(get_sh_sentiment_string)
-
-# Tab2 Col2. Growth vs Value
-gv_data = get_gv_data()
-if isinstance(gv_data.columns, pd.MultiIndex):
-    gv_data.columns = gv_data.columns.get_level_values(0)
-gv_returns = gv_data.pct_change(periods=252)
-gv_dev = pd.DataFrame(index=gv_returns.index)
-gv_dev['IVW_dev'] = (gv_returns['IVW'] - gv_returns['SPY']) * 100
-gv_dev['IVE_dev'] = (gv_returns['IVE'] - gv_returns['SPY']) * 100
-gv_dev['Diff'] = gv_dev['IVW_dev'] - gv_dev['IVE_dev']
-gv_dev['Score'] = gv_dev['Diff'].rolling(window=252).rank(pct=True) * 100
-gv_dev['Sentiment'] = gv_dev['Score'].apply(get_gv_sentiment_string)
-
-# --- Combine and Average Scores ---
-spy_scores = df_spy[['Score']].rename(columns={'Score': 'spy_score'})
-vix_scores = vix_df[['Calculated_Score']].rename(columns={'Calculated_Score': 'vix_score'})
-sh_scores = sh_returns[['Score']].rename(columns={'Score': 'sh_score'})
-gv_scores = gv_dev[['Score']].rename(columns={'Score': 'gv_score'})
-
-combined_sentiment_df = pd.concat([spy_scores, vix_scores, sh_scores, gv_scores], axis=1, join='outer')
-# Calculate the simple average across all four indicators
-combined_sentiment_df['overall_average_sentiment'] = combined_sentiment_df[['spy_score', 'vix_score', 'sh_score', 'gv_score']].mean(axis=1)
-# Categorize based on user-defined ranges
-combined_sentiment_df['overall_label'] = combined_sentiment_df['overall_average_sentiment'].apply(get_overall_sentiment_string)
+def data_age_caption(as_of, status):
+    """Builds the "as of" caption from a dataset's last date and its cache status."""
+    caption = f"Data as of {as_of}"
+    if status['age'] is not None:
+        caption += f", fetched {status['age'] / 60:.0f} min ago"
+    if status['refreshing']:
+        caption += " (refreshing in background)"
+    return caption
+
+# --- Load Precomputed Snapshot ---
+# Written by worker.py (or computed live when no worker snapshot exists); reruns only read it
+snapshot = get_snapshot()
+
+df_spy = snapshot['spy']                                    # Tab1 Col1. S&P 500 Trend
+vix_df = snapshot['vix']                                    # Tab1 Col2. VIX Trend (Inverted)
+sh_returns = snapshot['sh']                                 # Tab2 Col1. Safe Haven Demand
+gv_dev = snapshot['gv']                                     # Tab2 Col2. Growth vs Value
+combined_sentiment_df = snapshot['combined_sentiment_df']   # Aggregate of the four scores
 
 # Get current score
 latest_score = combined_sentiment_df['overall_average_sentiment'].iloc[-1]
@@ -204,6 +136,7 @@ with col_stat:
     else: st.error(f"**{latest_label}**")
 
     st.metric("Aggregate Score", f"{latest_score:.0f}/100")
+    st.caption(data_age_caption(snapshot['as_of'], get_data_status()))
     #st.write("This score is the simple average of all four market indicators.")
 
 with col_chart:
@@ -259,7 +192,7 @@ with col_chart:
     st.plotly_chart(fig_overall_sentiment, width='stretch', config={'displayModeBar': False, 'scrollZoom': False})
 
 # Setup tabs for different catagories of indicators
-tab1, tab2, tab3, tab4 = st.tabs(["Market Trend", "Asset Allocation", "Research Appendix", "Options Activity"])
+tab1, tab2, tab3, tab4, tab5 = st.tabs(["Market Trend", "Asset Allocation", "Research Appendix", "Options Activity", "Universes"])
 
 
 # ==========================================
@@ -658,21 +591,14 @@ with tab3:
         st.write(texts["results"])
         st.write(texts["discussion"])
 
-    with col2:
-        def analyze_standardized_correlation(combined_sentiment_df, df_spy):
-            df = pd.concat([
-                combined_sentiment_df[['overall_average_sentiment']],
-                df_spy[['Close']]
-            ], axis=1).dropna()
-
-            df['sentiment_pct'] = df['overall_average_sentiment'].pct_change()
-            df['spy_pct'] = df['Close'].pct_change()
-            df.dropna(inplace=True)
+        # Every window and indicator is precomputed in pipeline.analyze_standardized_correlation
+        corr_window = st.radio("Rolling window (days)", CORR_WINDOWS, index=CORR_WINDOWS.index(60), horizontal=True)
+        titles = {ind.name: ind.title for ind in default_indicators()}
+        corr_indicators = st.multiselect("Compare indicators", list(titles), format_func=titles.get)
 
-            # Z-Score Standardization
-            df['sentiment_z'] = (df['sentiment_pct'] - df['sentiment_pct'].mean()) / df['sentiment_pct'].std()
-            df['spy_z'] = (df['spy_pct'] - df['spy_pct'].mean()) / df['spy_pct'].std()
-            df['rolling_corr'] = df['sentiment_z'].rolling(window=60).corr(df['spy_z'])
+    with col2:
+        def plot_standardized_correlation(df, window, compare):
+            # Z-scores and rolling correlation precomputed in pipeline.analyze_standardized_correlation
 
             # --- Generate Plot ---
             # Subplot: isolates Z-Score and Correlation Analysis
@@ -681,7 +607,7 @@ with tab3:
               shared_xaxes=True,
               vertical_spacing=0.1,
               subplot_titles=(
-                  f"Z-Scores of Daily % Changes", "60-Day Rolling Correlation of Standardized % Change"
+                  f"Z-Scores of Daily % Changes", f"{window}-Day Rolling Correlation of Standardized % Change"
               )
             )
 
@@ -703,12 +629,20 @@ with tab3:
 
             # Bottom Plot: Rolling Correlation
             fig.add_trace(go.Scatter(
-                x=df.index, y=df['rolling_corr'],
-                name="60D Roll. Corr.",
+                x=df.index, y=df[f'rolling_corr_{window}'],
+                name=f"{window}D Roll. Corr.",
                 fill='tozeroy',
                 line=dict(color='#1f77b4')
             ), row=2, col=1)
 
+            # Individual indicators: daily score changes vs SPY returns
+            for name in compare:
+                fig.add_trace(go.Scatter(
+                    x=df.index, y=df[f'{name}_corr_{window}'],
+                    name=f"{name.upper()} {window}D Corr.",
+                    line=dict(width=1)
+                ), row=2, col=1)
+
             fig.update_layout(
                 title_text="Market Sentiment Score vs. SPY Performance",
                 yaxis_range=[-3, 3],
@@ -725,7 +659,7 @@ with tab3:
             fig.update_yaxes(title_text="Correlation Coefficient", range=[-1, 1], row=2, col=1)
             return fig
 
-        fig_corr = analyze_standardized_correlation(combined_sentiment_df, df_spy)
+        fig_corr = plot_standardized_correlation(snapshot['correlation'], corr_window, corr_indicators)
         st.plotly_chart(fig_corr, width='stretch')
 
     st.divider()
@@ -741,21 +675,20 @@ with tab3:
         st.write(texts["results"])
         st.write(texts["discussion"])
 
-    with col2:
-        def plot_recovery_boxplot(combined_sentiment_df):
-            df = combined_sentiment_df[['overall_average_sentiment']].copy()
-            df.index = pd.to_datetime(df.index)
-
-            EF_THRESHOLD, NEUTRAL_THRESHOLD = 25, 45 # Sentiment Score Threasholds
-            is_extreme_fear = df['overall_average_sentiment'] < EF_THRESHOLD # Triggers counter when score < 25
-            ef_entries = df.index[is_extreme_fear & (~is_extreme_fear.shift(1, fill_value=False))]
+        # [episodes.py] every (from, to) pair of labels, precomputed in pipeline.run_pipeline
+        transitions = snapshot['transitions']
+        states = list(transitions['From'].cat.categories)
+        from_state = st.selectbox("From", states, index=states.index("Extreme Fear"))
+        targets = [s for s in states if s != from_state]
+        to_state = st.selectbox("Until", targets, index=targets.index("Neutral") if "Neutral" in targets else 0)
+        st.write("Median calendar days from entering a state (rows) until the label reaches another (columns), or beyond it in the same direction:")
+        st.dataframe(duration_matrix(transitions).round(0))
 
-            durations = []
-            for start_date in ef_entries:
-                future_data = df.loc[start_date:]
-                recovery_event = future_data[future_data['overall_average_sentiment'] >= NEUTRAL_THRESHOLD] # Count calendar days until score >= 45
-                if not recovery_event.empty:
-                    durations.append((recovery_event.index[0] - start_date).days)
+    with col2:
+        def plot_recovery_boxplot(transitions, from_state, to_state):
+            # Calendar days from each entry into `from_state` until `to_state` is reached
+            selected = (transitions['From'] == from_state) & (transitions['To'] == to_state)
+            durations = transitions.loc[selected, 'Days'].tolist()
 
             if not durations:
                 return None
@@ -774,7 +707,7 @@ with tab3:
             # Update Layout to match Dashboard theme
             fig.update_layout(
                 title={
-                    'text': "Distribution of Recovery Times: Extreme Fear to Neutral",
+                    'text': f"Distribution of Recovery Times: {from_state} to {to_state}",
                     'y': 0.9,
                     'x': 0.5,
                     'xanchor': 'center',
@@ -792,8 +725,112 @@ with tab3:
             )
             return fig
 
-        fig_recov = plot_recovery_boxplot(combined_sentiment_df)
-        st.plotly_chart(fig_recov, width='stretch')
+        fig_recov = plot_recovery_boxplot(transitions, from_state, to_state)
+        if fig_recov is not None:
+            st.plotly_chart(fig_recov, width='stretch')
+        else:
+            st.info(f"No completed {from_state} to {to_state} episodes in the sample.")
+
+    st.divider()
+
+    # --- Regime Dynamics ---
+    col1, col2 = st.columns([1, 1])
+
+    # [regime_analytics.py] Markov transition matrices, dwell times and stationary distribution of the overall label
+    regime_transitions = snapshot['regime_transitions']
+
+    with col1:
+        st.subheader("Regime Dynamics")
+        st.write("The overall label treated as a Markov chain: each row of the matrix is the empirical probability of being in each state a given number of trading days after being in the row's state. The stationary distribution is the long-run share of days in each state implied by the daily matrix, and dwell times are the lengths of uninterrupted runs of one label.")
+        regime_step = st.radio("Step (trading days)", sorted(int(k) for k in regime_transitions['Step'].unique()), horizontal=True)
+        # Dwell statistics over completed runs only; the run still open at the end is shown on its own
+        dwell = snapshot['regime_dwell']
+        completed = dwell[~dwell['Censored']].groupby('State', observed=False)['Days']
+        regime_summary = pd.DataFrame({
+            'Stationary Share': snapshot['regime_stationary'].set_index('State')['Probability'],
+            'Median Dwell (days)': completed.median(),
+            'Longest Dwell (days)': completed.max(),
+            'Runs': completed.size(),
+        })
+        st.dataframe(regime_summary.round(2))
+        current = dwell[dwell['Censored']]
+        if len(current):
+            days = int(current['Days'].iloc[-1])
+            st.caption(f"Current run: {current['State'].iloc[-1]} for {days} trading day{'s' * (days != 1)} so far, "
+                       "still open and left out of the dwell statistics above.")
+
+    with col2:
+        matrix = regime_transitions[regime_transitions['Step'] == regime_step].pivot_table(
+            index='From', columns='To', values='Probability', observed=False, dropna=False)
+        fig_markov = go.Figure(go.Heatmap(
+            x=list(matrix.columns), y=list(matrix.index), z=matrix.to_numpy(),
+            colorscale='Blues', zmin=0, zmax=1, texttemplate='%{z:.2f}',
+            hovertemplate='%{y} → %{x}: %{z:.1%}<extra></extra>'))
+        fig_markov.update_layout(
+            title={'text': f"{regime_step}-Day Transition Probabilities", 'y': 0.95, 'x': 0.5, 'xanchor': 'center'},
+            xaxis_title="To", yaxis=dict(title="From", autorange='reversed'),
+            height=500,
+            paper_bgcolor='#f9f9f9',
+            plot_bgcolor='#f9f9f9'
+        )
+        st.plotly_chart(fig_markov, width='stretch', config={'displayModeBar': False})
+
+    # Rolling one-year daily matrix: has the persistence of each regime shifted?
+    rolling = snapshot['regime_rolling']
+    rolling_from = st.selectbox("Rolling transition probabilities from", LABEL_ORDER, index=0)
+    fig_rolling = go.Figure()
+    for to_state in LABEL_ORDER:
+        fig_rolling.add_trace(go.Scatter(
+            x=rolling.index, y=rolling[f'{rolling_from} → {to_state}'], name=to_state, stackgroup='one',
+            hovertemplate=f'<b>{to_state}:</b> %{{y:.1%}}<extra></extra>'))
+    fig_rolling.update_layout(
+        title=f"Next-Day State after {rolling_from} (Trailing 252 Trading Days)",
+        yaxis=dict(title="Probability", range=[0, 1]),
+        hovermode='x unified',
+        height=400,
+        dragmode='pan',
+        paper_bgcolor='#f9f9f9',
+        plot_bgcolor='#f9f9f9'
+    )
+    st.plotly_chart(fig_rolling, width='stretch', config={'displayModeBar': False, 'scrollZoom': False})
+
+    st.divider()
+
+    # --- Event Study ---
+    col1, col2 = st.columns([1, 2])
+
+    # [event_study.py] paths around each entry into an extreme label, precomputed in pipeline.run_pipeline
+    events = snapshot['event_study']
+
+    with col1:
+        st.subheader("Event Study: Sentiment Extremes")
+        st.write("Average path of SPY, the VIX and treasuries (IEF) from 20 trading days before to 60 days after each entry into Extreme Fear or Extreme Greed, as the % change from the close on the entry day. An entry within 60 days of the previous one is skipped, so no event is counted twice. The band spans the 25th to 75th percentile across events and the dashed line is the median.")
+        event_type = st.radio("Event", ['Extreme Fear', 'Extreme Greed'], horizontal=True, key='event_type')
+        n_events = events.loc[(events['Event'] == event_type) & (events['Offset'] == 0), 'count'].max()
+        st.write(f"Events: {0 if pd.isna(n_events) else int(n_events)}")
+
+    with col2:
+        fig_event = make_subplots(rows=1, cols=3, subplot_titles=("SPY", "VIX", "IEF"), shared_xaxes=True)
+        for i, ticker in enumerate(['SPY', '^VIX', 'IEF']):
+            path = events[(events['Event'] == event_type) & (events['Ticker'] == ticker)]
+            fig_event.add_trace(go.Scatter(x=path['Offset'], y=path['q75'], line=dict(width=0), showlegend=False, hoverinfo='skip'), row=1, col=i + 1)
+            fig_event.add_trace(go.Scatter(x=path['Offset'], y=path['q25'], line=dict(width=0), fill='tonexty',
+                                           fillcolor='rgba(31, 119, 180, 0.2)', showlegend=False, hoverinfo='skip'), row=1, col=i + 1)
+            fig_event.add_trace(go.Scatter(x=path['Offset'], y=path['q50'], line=dict(color='#1f77b4', dash='dash', width=1),
+                                           showlegend=False, hovertemplate='Median: %{y:.2f}%<extra></extra>'), row=1, col=i + 1)
+            fig_event.add_trace(go.Scatter(x=path['Offset'], y=path['mean'], line=dict(color='#1f77b4'),
+                                           showlegend=False, hovertemplate='Day %{x}<br>Mean: %{y:.2f}%<extra></extra>'), row=1, col=i + 1)
+            fig_event.add_vline(x=0, line_dash="dash", line_color="grey", row=1, col=i + 1)
+        fig_event.update_layout(
+            title=f"Average Path around {event_type} Entries",
+            height=450,
+            dragmode='pan',
+            paper_bgcolor='#f9f9f9',
+            plot_bgcolor='#f9f9f9'
+        )
+        fig_event.update_xaxes(title_text="Trading Days from Entry")
+        fig_event.update_yaxes(title_text="% Change from Entry", col=1)
+        st.plotly_chart(fig_event, width='stretch', config={'displayModeBar': False, 'scrollZoom': False})
 
     st.divider()
 
@@ -809,38 +846,34 @@ with tab3:
         st.write(texts["discussion"])
 
     with col2:
-        def plot_multi_horizon_performance(combined_sentiment_df, df_spy):
-
-            data = pd.DataFrame(index=combined_sentiment_df.index)
-            data['Label'] = combined_sentiment_df['overall_label']
-            data['Price'] = df_spy['Close']
-            data.dropna(subset=['Label', 'Price'], inplace=True)
-
-            horizons = {'1-Month': 21, '3-Months': 63, '6-Months': 126, '12-Months': 252} # Trading day approximations
-
-            for name, period in horizons.items():
-                data[f'{name}_Ret'] = (data['Price'].shift(-period) / data['Price'] - 1) * 100
-
-            label_order = ["Extreme Fear", "Fear", "Neutral", "Greed", "Extreme Greed"]
-            performance_cols = [f'{name}_Ret' for name in horizons.keys()]
-
-            long_df = data.melt(id_vars=['Label'], value_vars=performance_cols, var_name='Horizon_Ret_Col', value_name='Return')
-            long_df['Horizon'] = long_df['Horizon_Ret_Col'].str.replace('_Ret', '')
-            long_df['Label'] = pd.Categorical(long_df['Label'], categories=label_order, ordered=True)
-            long_df.sort_values(by=['Label', 'Horizon'], inplace=True)
-
+        def plot_multi_horizon_performance(summary, outliers):
+            # Box statistics and outliers per Label / Horizon precomputed in pipeline.forward_return_summary,
+            # so only a handful of numbers per box reach the browser instead of every daily return
             fig = go.Figure()
             colors = ['#aec7e8', '#7fb3d5', '#2980b9', '#154360'] # Light to Dark Blue
 
-            for i, horizon_name in enumerate(horizons.keys()):
-                horizon_data = long_df[long_df['Horizon'] == horizon_name]
+            for i, horizon_name in enumerate(HORIZONS.keys()):
+                stats = summary[summary['Horizon'] == horizon_name]
+                points = outliers[outliers['Horizon'] == horizon_name]
                 fig.add_trace(go.Box(
-                    x=horizon_data['Label'],
-                    y=horizon_data['Return'],
+                    x=stats['Label'],
+                    q1=stats['q1'], median=stats['median'], q3=stats['q3'], mean=stats['mean'],
+                    lowerfence=stats['lowerfence'], upperfence=stats['upperfence'],
                     name=horizon_name,
+                    legendgroup=horizon_name,
+                    offsetgroup=horizon_name,
                     marker_color=colors[i],
-                    boxpoints='outliers',
                     boxmean=True))
+                fig.add_trace(go.Scatter(
+                    x=points['Label'],
+                    y=points['Return'],
+                    mode='markers',
+                    name=horizon_name,
+                    legendgroup=horizon_name,
+                    offsetgroup=horizon_name,
+                    showlegend=False,
+                    marker=dict(color=colors[i], size=4),
+                    hovertemplate='%{y:.2f}%<extra></extra>'))
 
             fig.update_layout(
                   title={
@@ -849,7 +882,9 @@ with tab3:
                   },
                   xaxis_title="Aggregate Sentiment",
                   yaxis_title="Forward Return (%)",
+                  xaxis=dict(categoryorder='array', categoryarray=LABEL_ORDER),
                   boxmode='group', # Groups the boxes for each sentiment label
+                  scattermode='group', # Lines the outliers up with their box
                   template="plotly_white",
                   legend=dict(
                       orientation="h",
@@ -865,42 +900,81 @@ with tab3:
             fig.add_hline(y=0, line_dash="solid", line_color="black", line_width=1)
             return fig
 
-        fig_perf = plot_multi_horizon_performance(combined_sentiment_df, df_spy)
+        fig_perf = plot_multi_horizon_performance(snapshot['forward_summary'], snapshot['forward_outliers'])
         st.plotly_chart(fig_perf, width='stretch')
 
+    # --- Regime Differences ---
+    col1, col2 = st.columns([1, 1])
 
-# ==========================================
-# TAB 4: OPTIONS ACTIVITY
-# ==========================================
-with tab4:
-    # --- Put/Call Sentiment ---
+    # [bootstrap.py] block-bootstrap intervals precomputed by the background worker
+    with col1:
+        st.subheader("Are the Regime Differences Significant?")
+        st.write("Forward returns over overlapping windows are strongly autocorrelated, so day-by-day resampling overstates precision. Each difference in mean or median forward return between two sentiment regimes is therefore tested with a block bootstrap that resamples blocks of consecutive days as long as the horizon. The table shows the observed difference (Regime minus Versus), its 95% interval and the two-sided p-value for no difference.")
+        if 'bootstrap' in snapshot:
+            boot_horizon = st.selectbox("Horizon", list(HORIZONS), key='bootstrap_horizon')
+            boot_stat = st.radio("Statistic", ['mean', 'median'], horizontal=True, key='bootstrap_statistic')
 
-    col1, col2 = st.columns([1, 3])
+    with col2:
+        if 'bootstrap' in snapshot:
+            boot = snapshot['bootstrap']
+            boot = boot[(boot['Horizon'] == boot_horizon) & (boot['Statistic'] == boot_stat)]
+            st.dataframe(boot.drop(columns=['Horizon', 'Statistic']).round(3), hide_index=True, width='stretch')
+        else:
+            st.info("Bootstrap intervals are computed by the background worker. Run `python worker.py` to populate them.")
 
-    option_chains, current_price = get_options_data('SPY')
+    st.divider()
 
-    # [SentimentScore_PutCall_Ratio.py]
+    # --- Parameter Sensitivity ---
+    col1, col2 = st.columns([1, 1])
 
-    pcr_results = []
+    # [sweep.py] appendix statistics over a grid of indicator windows and label thresholds, precomputed by the worker
+    sensitivity_metrics = {'label_agreement': 'Label agreement with defaults', 'latest_score': 'Latest aggregate score',
+                           'median_recovery_days': 'Median recovery (days)',
+                           **{f'{h}_fear_premium': f'{h} fear premium (%)' for h in HORIZONS}}
 
-    for entry in option_chains:
-      date = entry['date']
-      calls = entry['calls']
-      puts = entry['puts']
+    with col1:
+        st.subheader("Parameter Sensitivity")
+        st.write("The windows behind each indicator (125-day MA and 365-day rank for SPY, 50-day MA and 252-day rank for the VIX, the 20-day safe-haven spread and the 252-day growth/value lookback) and the label thresholds are judgment calls. Every combination on a grid of alternatives is re-run through the aggregate score and the statistics above. Label agreement is the share of days labeled as with the default parameters; the fear premium is the mean forward return after Fear / Extreme Fear days minus after Greed / Extreme Greed days.")
+        if 'sensitivity' in snapshot:
+            sensitivity = snapshot['sensitivity']
+            param_cols = [c for c in sensitivity.columns if c not in sensitivity_metrics]
+            metric = st.selectbox("Statistic", list(sensitivity_metrics), format_func=sensitivity_metrics.get, index=4)
+            x_param = st.selectbox("Horizontal axis", param_cols, index=param_cols.index('spy_ma_window'))
+            y_param = st.selectbox("Vertical axis", [c for c in param_cols if c != x_param], index=0)
 
-      # Access volume and openInterest directly from the calls and puts DataFrames
-      v_put = puts['volume'].sum()
-      v_call = calls['volume'].sum()
-      oi_put = puts['openInterest'].sum() # Corrected access
-      oi_call = calls['openInterest'].sum() # Corrected access
+    with col2:
+        if 'sensitivity' in snapshot:
+            # Mean over every other parameter of the grid
+            heat = sensitivity.pivot_table(index=y_param, columns=x_param, values=metric, aggfunc='mean')
+            fig_sens = go.Figure(go.Heatmap(
+                x=[str(c) for c in heat.columns], y=[str(i) for i in heat.index], z=heat.to_numpy(),
+                colorscale='RdBu', texttemplate='%{z:.2f}',
+                hovertemplate=f'{x_param}: %{{x}}<br>{y_param}: %{{y}}<br>{sensitivity_metrics[metric]}: %{{z:.2f}}<extra></extra>'))
+            fig_sens.update_layout(
+                title={'text': f"{sensitivity_metrics[metric]} across the Parameter Grid", 'y': 0.95, 'x': 0.5, 'xanchor': 'center'},
+                xaxis=dict(title=x_param, type='category'),
+                yaxis=dict(title=y_param, type='category'),
+                height=600,
+                paper_bgcolor='#f9f9f9',
+                plot_bgcolor='#f9f9f9'
+            )
+            st.plotly_chart(fig_sens, width='stretch', config={'displayModeBar': False})
+        else:
+            st.info("The sensitivity grid is computed by the background worker. Run `python worker.py` to populate it.")
+
+
+# ==========================================
+# TAB 4: OPTIONS ACTIVITY
+# ==========================================
+with tab4:
+    # --- Put/Call Sentiment ---
 
-      # Calculate ratios with safety checks for division by zero
-      v_ratio = v_put / v_call if v_call > 0 else 0
-      oi_ratio = oi_put / oi_call if oi_call > 0 else 0
+    col1, col2 = st.columns([1, 3])
 
-      pcr_results.append({'date': date, 'v_pcr': v_ratio, 'oi_pcr': oi_ratio})
+    # [SentimentScore_PutCall_Ratio.py] ratios per expiration precomputed in pipeline.options_analytics
+    pcr_df = snapshot['expiry_metrics']
+    current_price = snapshot['current_price']
 
-    pcr_df = pd.DataFrame(pcr_results)
     # Simple logic for "Highest Sentiment" quadrant
     avg_v = pcr_df['v_pcr'].mean()
     avg_oi = pcr_df['oi_pcr'].mean()
@@ -922,13 +996,11 @@ with tab4:
         get_pcr_sentiment(pcr_df)
         st.write("Avg Vol PCR:", f"{avg_v:.2f}")
         st.write("Avg OI PCR:", f"{avg_oi:.2f}")
+        st.caption(data_age_caption(snapshot['options_as_of'], get_data_status()))
         st.write("Put/Call Ratio measures the trading activity on Put relative to Call options. A ratio above 1 suggests bearish sentiment (more puts), while below 1 indicates bullishness (more calls). Furthermore, PCR can be divided into volume and open interest, which can be roughly interpreted as the immediate flow and existing commitment, respectively.")
 
     # [Plotly_PutCall_Ratio.py]
 
-    today_ts = pd.Timestamp(dt.now().date())
-    pcr_df['DTE'] = (pd.to_datetime(pcr_df['date']) - today_ts).dt.days
-
     with col2:
         fig_pcr = go.Figure(data=[
             go.Bar(x=pcr_df['DTE'], y=pcr_df['v_pcr'], name='Vol',
@@ -954,105 +1026,52 @@ with tab4:
     # --- Skew Diagnostics ---
     col1, col2 = st.columns([1, 3])
 
-    # [SentimentScore_VolatilitySkew.py]
-    ATM_WIN, OTM_PCT = 0.01, 0.10 # 1% ATM window, +-10% OTM window
-    skew_results = []
-
-    # Plotly_VolatilitySkew.py moved ahead to share option_chains loop
-    # Color code calls and puts, lighter color = further expiration
-    fig_skew = go.Figure()
-
-    # Set default X-axis view to +-5% from current SPY price
-    x_min, x_max = current_price * 0.95, current_price * 1.05
-    all_ivs = []
-
-    # Per-date loop for the all SPY options in the nearest 14 expirations
-    for i, entry in enumerate(option_chains):
-        exp_date = entry['date']
-        calls = entry['calls'].copy()
-        puts = entry['puts'].copy()
-        dte = (dt.strptime(exp_date, '%Y-%m-%d').date() - dt.now().date()).days
-
-        calls["type"] = "call"
-        puts["type"] = "put"
-
-        # Indentify ATM and OTM options
-        df_skew = pd.concat([calls, puts])
-        df_skew = df_skew[df_skew["impliedVolatility"] > 0]
-        df_skew["moneyness"] = df_skew["strike"] / current_price
-
-        atm = df_skew[(df_skew["moneyness"] > 1 - ATM_WIN) & (df_skew["moneyness"] < 1 + ATM_WIN)]
-        otm_calls = df_skew[(df_skew["type"] == "call") & (df_skew["moneyness"] > 1 + OTM_PCT)]
-        otm_puts = df_skew[(df_skew["type"] == "put") & (df_skew["moneyness"] < 1 - OTM_PCT)]
-
-        # Compute "Tail-skew", "Put Convexity", and "Call-FOMO"
-        if not (atm.empty or otm_calls.empty or otm_puts.empty):
-            m = {"tail": otm_puts["impliedVolatility"].mean() / otm_calls["impliedVolatility"].mean(),
-                 "put_conv": otm_puts["impliedVolatility"].mean() / atm["impliedVolatility"].mean(),
-                 "call_fomo": otm_calls["impliedVolatility"].mean() / atm["impliedVolatility"].mean()}
-            skew_results.append(m)
-
-        # Plotly metrics
-        for df_opt, color_base in [(calls, '0, 128, 0'), (puts, '255, 0, 0')]:
-            df_opt = df_opt[df_opt['impliedVolatility'] > 0.001]
-            df_opt['smooth'] = df_opt['impliedVolatility'].rolling(window=5, min_periods=1, center=True).mean()
-            alpha = 1.0 - (i / len(option_chains)) * 0.9
-
-            fig_skew.add_trace(
-                go.Scatter(
-                    x=df_opt['strike'],
-                    y=df_opt['smooth'] * 100,
-                    mode='lines',
-                    line=dict(color=f'rgba({color_base}, {alpha})', width=1),
-                    showlegend=False,
-                    hovertemplate=(
-                        f'<b>DTE:</b> {dte}<br>'
-                        '<b>Strike:</b> %{x:.0f}<br>'
-                        '<b>IV:</b> %{y:.2f}%'
-                        '<extra></extra>'
-                        )
-                    )
-                )
-            # Collect IV for axis scaling
-            mask = (df_opt['strike'] >= x_min) & (df_opt['strike'] <= x_max)
-            all_ivs.extend((df_opt.loc[mask, 'smooth'] * 100).tolist())
+    # [vol_surface.py] IV surface and the skew metrics read off it, precomputed in pipeline.run_pipeline
+    surface = snapshot['vol_surface']
+    surface_metrics = snapshot['surface_metrics']
+    grid = surface.pivot(index='DTE', columns='log_moneyness', values='iv')
 
-    # Diagnostic results based on average
+    # Diagnostic results based on the averages across the DTE grid, in vol points
     with col1:
-        # Compute the average of "Tail-skew", "Put Convexity", and "Call-FOMO" across all expirations
-        df_m = pd.DataFrame(skew_results)
-        avg_tail, avg_conv, avg_fomo = df_m["tail"].mean(), df_m["put_conv"].mean(), df_m["call_fomo"].mean()
-        ts_slope = df_m.iloc[-1]["tail"] - df_m.iloc[0]["tail"]
+        summary = surface_summary(surface_metrics)
+        # Thresholds from the archived history once it is long enough (see vol_surface.ALERT_LEVELS)
+        levels = alert_levels(snapshot['options_history'])
+        rr, ts_slope = summary['rr'], summary['term_slope']
 
         st.subheader("Skew Diagnostics")
-        if avg_tail > 1.3: st.error("- Strong downside tail fear")
-        elif avg_tail > 1.1: st.warning("- Moderate downside risk awareness")
+        if rr < levels['rr_strong']: st.error("- Strong downside tail fear")
+        elif rr < levels['rr_moderate']: st.warning("- Moderate downside risk awareness")
         else: st.success("- Balanced tail risk")
 
-        if avg_conv > 1.4: st.error("- Crash protection demand elevated")
-        if avg_fomo > 1.2: st.warning("- Upside FOMO / squeeze risk")
-        if ts_slope < -0.1: st.error("- Near-term fear dominant")
-        if ts_slope > 0.2: st.warning("- Long-term risk feared")
+        if summary['put_premium'] > levels['put_premium']: st.error("- Crash protection demand elevated")
+        if summary['call_premium'] > levels['call_premium']: st.warning("- Upside FOMO / squeeze risk")
+        if ts_slope < levels['slope_low']: st.error("- Near-term fear dominant")
+        elif ts_slope > levels['slope_high']: st.warning("- Long-term risk feared")
         else: st.success("- Stable term-structure sentiment")
-        st.write("Implied Volatility (IV) significantly impacts option premiums. IV positively correlates to the expectation that the underlying option ends up “in the money”. Therefore, the volatility skew curve is a direct visualization of supply and demand dynamics influenced by trader sentiments. ")
+        st.write("25Δ Risk Reversal:", f"{rr:.2f} vol pts")
+        st.write("25Δ Butterfly:", f"{summary['bf']:.2f} vol pts")
+        st.write("ATM Term Slope:", f"{ts_slope:.2f} vol pts / 30 days")
+        st.write("Implied Volatility (IV) significantly impacts option premiums. IV positively correlates to the expectation that the underlying option ends up “in the money”. Therefore, the volatility surface is a direct visualization of supply and demand dynamics influenced by trader sentiments. The surface fits a smile to the out-of-the-money options of every expiration and interpolates between expirations; the risk reversal (25-delta call minus put IV), butterfly (25-delta wings over ATM) and term slope are read off it.")
 
-    # [Plotly_VolatilitySkew.py]
+    # [Plotly_VolatilitySkew.py] one heatmap of the fitted surface in place of a curve per expiration
 
     with col2:
-        # Set default Y-axis view to +-5% from ATM IV
-        if all_ivs:
-            ymin, ymax = min(all_ivs) * 0.95, max(all_ivs) * 1.05
-        else:
-            ymin, ymax = 0, 100
+        fig_skew = go.Figure(go.Heatmap(
+            x=grid.columns * 100,
+            y=grid.index,
+            z=grid.to_numpy() * 100,
+            colorscale='RdYlGn_r',
+            colorbar=dict(title='IV (%)'),
+            hovertemplate='<b>DTE:</b> %{y:.0f}<br><b>ln(K/F):</b> %{x:.1f}%<br><b>IV:</b> %{z:.2f}%<extra></extra>'
+            ))
 
-        # Center line for current SPY price
-        fig_skew.add_vline(x=current_price, line_dash="dash", line_color="grey")
+        # Center line at the forward
+        fig_skew.add_vline(x=0, line_dash="dash", line_color="grey")
         fig_skew.update_layout(
-            title=f"Volatility Skew (Current Price: {current_price:.2f})",
-            xaxis_title="Strikes",
-            yaxis_title="Implied Volatility (IV)",
-            xaxis_range=[x_min, x_max],
-            yaxis_range=[ymin, ymax],
+            title=f"Implied Volatility Surface (Current Price: {current_price:.2f})",
+            xaxis_title="Log-Moneyness ln(K/F) (%)",
+            xaxis_range=[-20, 10],
+            yaxis_title="Days to Expiration",
             height=600,
             dragmode='pan',
             paper_bgcolor='#f9f9f9',
@@ -1061,3 +1080,123 @@ with tab4:
         st.plotly_chart(fig_skew, width='stretch', config={'displayModeBar': False})
 
 
+    # --- Dealer Positioning ---
+    col1, col2 = st.columns([1, 3])
+
+    # [positioning.py] per-strike gamma exposure, zero-gamma level and max pain precomputed in pipeline.run_pipeline
+    gex_profile = snapshot['gex_profile']
+    net_gex, zero_gamma, max_pain = snapshot['net_gex'], snapshot['zero_gamma'], snapshot['max_pain']
+
+    with col1:
+        st.subheader("Dealer Positioning")
+        if net_gex > 0: st.success("**Positive Gamma**")
+        else: st.error("**Negative Gamma**")
+        st.write("Net GEX:", f"${net_gex / 1e9:.2f}B per 1% move")
+        st.write("Zero-Gamma Level:", "n/a" if pd.isna(zero_gamma) else f"{zero_gamma:.2f}")
+        st.write("Max Pain:", "n/a" if pd.isna(max_pain) else f"{max_pain:.0f}")
+        st.write("Gamma exposure (GEX) estimates how much option dealers must buy or sell as the price moves, assuming customers are net sellers of calls and buyers of puts, so dealers on the other side are long call gamma and short put gamma. With positive gamma dealers trade against the move and dampen volatility; below the zero-gamma level they trade with it and amplify volatility. Max pain is the strike at which the open options would expire with the least total payout to their holders.")
+
+    with col2:
+        # Strikes within +-10% of the current price
+        in_view = gex_profile[(gex_profile['strike'] >= current_price * 0.9) & (gex_profile['strike'] <= current_price * 1.1)]
+        fig_gex = go.Figure(data=[
+            go.Bar(x=in_view['strike'], y=in_view['call_gex'] / 1e9, name='Calls', marker_color='green',
+              hovertemplate='<b>Strike:</b> %{x:.0f}<br><b>Call GEX:</b> $%{y:.3f}B<extra></extra>'),
+            go.Bar(x=in_view['strike'], y=in_view['put_gex'] / 1e9, name='Puts', marker_color='red',
+              hovertemplate='<b>Strike:</b> %{x:.0f}<br><b>Put GEX:</b> $%{y:.3f}B<extra></extra>')
+        ])
+        fig_gex.add_vline(x=current_price, line_dash="dash", line_color="grey", annotation_text="Price")
+        if not pd.isna(zero_gamma):
+            fig_gex.add_vline(x=zero_gamma, line_dash="dot", line_color="black", annotation_text="Zero Gamma")
+        if not pd.isna(max_pain):
+            fig_gex.add_vline(x=max_pain, line_dash="dot", line_color="purple", annotation_text="Max Pain", annotation_position="bottom right")
+        fig_gex.update_layout(
+            barmode='relative',
+            dragmode='pan',
+            paper_bgcolor='#f9f9f9',
+            plot_bgcolor='#f9f9f9',
+            title='Dealer Gamma Exposure by Strike (All Fetched Expirations)',
+            xaxis_title='Strike',
+            yaxis_title='GEX ($B per 1% move)'
+            )
+        st.plotly_chart(fig_gex, width='stretch', config={'displayModeBar': False, 'scrollZoom': False})
+
+
+    # --- Options Sentiment History ---
+    col1, col2 = st.columns([1, 3])
+
+    # [options_archive.py] daily PCR / skew series rebuilt from the archived chains
+    history = snapshot['options_history']
+    history_labels = {'v_pcr': 'Vol PCR', 'oi_pcr': 'OI PCR', 'tail': 'Tail-skew', 'put_conv': 'Put Convexity', 'call_fomo': 'Call-FOMO'}
+
+    with col1:
+        st.subheader("Options Sentiment History")
+        if len(history) >= 2:
+            # Percentile rank of the latest archived day within the whole archive
+            for col, label in history_labels.items():
+                series = history[col].dropna()
+                if not series.empty:
+                    st.write(f"{label}:", f"{series.iloc[-1]:.2f} ({(series <= series.iloc[-1]).mean() * 100:.0f}th pct)")
+        st.write("Daily averages across the nearest 14 expirations of the put/call ratios and skew metrics above, rebuilt from the end-of-day option chains archived by the background worker. Percentiles rank the latest day against the full archive.")
+
+    with col2:
+        if len(history) >= 2:
+            fig_hist = go.Figure()
+            for col, label in history_labels.items():
+                fig_hist.add_trace(go.Scatter(x=history.index, y=history[col], name=label,
+                                              hovertemplate=f'<b>{label}:</b> %{{y:.2f}}<extra></extra>'))
+            fig_hist.update_layout(
+                dragmode='pan',
+                paper_bgcolor='#f9f9f9',
+                plot_bgcolor='#f9f9f9',
+                title='Put/Call Ratios and Skew Metrics (Daily Archive)',
+                yaxis_title='Ratio',
+                hovermode='x unified',
+                )
+            st.plotly_chart(fig_hist, width='stretch', config={'displayModeBar': False, 'scrollZoom': False})
+        else:
+            st.info("Not enough archived option chains yet. The history fills in as `python worker.py` archives one chain per trading day.")
+
+
+
+# ==========================================
+# TAB 5: UNIVERSES
+# ==========================================
+with tab5:
+    # [universe_engine.py] scores precomputed by the background worker for every member of each universe
+    universe_names = [key[len('universe_'):-len('_scores')] for key in snapshot if key.startswith('universe_') and key.endswith('_scores')]
+
+    if universe_names:
+        universe = st.selectbox("Universe", universe_names, format_func=str.title)
+        scores = snapshot[f'universe_{universe}_scores']
+        labels = snapshot[f'universe_{universe}_labels']
+
+        col1, col2 = st.columns([1, 3])
+
+        with col1:
+            st.subheader(f"{universe.title()} Sentiment")
+            # Latest score of each field per member, strongest overall first
+            latest = scores.iloc[-1].unstack()[['overall', 'trend', 'volatility', 'safe_haven', 'rotation']]
+            latest.insert(1, 'label', labels.iloc[-1])
+            st.dataframe(latest.sort_values('overall', ascending=False).round(0),
+                         column_config={'overall': 'Overall', 'label': 'Sentiment', 'trend': 'Trend', 'volatility': 'Volatility',
+                                        'safe_haven': 'Safe Haven', 'rotation': 'Rotation'})
+            st.write("Each member is scored with the dashboard's methodology: trend vs its 125-day moving average, its own realized volatility in place of the VIX, demand for treasuries (IEF) relative to it, and relative strength against the universe benchmark in place of growth vs value. The overall score is the mean of the four.")
+
+        with col2:
+            fig_universe = go.Figure()
+            for member in scores.columns.get_level_values('Member').unique():
+                fig_universe.add_trace(go.Scatter(x=scores.index, y=scores[(member, 'overall')], name=member,
+                                                  hovertemplate=f'<b>{member}:</b> %{{y:.0f}}<extra></extra>'))
+            fig_universe.update_layout(
+                dragmode='pan',
+                paper_bgcolor='#f9f9f9',
+                plot_bgcolor='#f9f9f9',
+                title=f'Overall Sentiment Score by Member ({universe.title()})',
+                yaxis_title='Score',
+                yaxis_range=[0, 100],
+                hovermode='x unified',
+                )
+            st.plotly_chart(fig_universe, width='stretch', config={'displayModeBar': False, 'scrollZoom': False})
+    else:
+        st.info("Universe scores are computed by the background worker. Run `python worker.py` to populate this tab.")
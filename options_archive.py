@@ -0,0 +1,92 @@
+import os
+import glob
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from datetime import date as ddate
+from pipeline import grouped_options_metrics
+from vol_surface import SUMMARY_COLUMNS, fit_surface, surface_summary
+
+# Daily archive of option chain tables, one compressed Arrow IPC file per day and symbol
+  # <ARCHIVE_DIR>/date=YYYY-MM-DD/<symbol>.arrow   compact chain table, spot price in the schema metadata
+ARCHIVE_DIR = os.environ.get(
+    'OPTIONS_ARCHIVE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'options_archive')
+)
+COMPRESSION = 'zstd'
+
+HISTORY_COLUMNS = ['v_pcr', 'oi_pcr', 'tail', 'put_conv', 'call_fomo']
+
+
+def _partition_path(symbol, day, archive_dir):
+    return os.path.join(archive_dir, f"date={day:%Y-%m-%d}", f"{symbol.replace('^', '_')}.arrow")
+
+
+def archive_chain(option_chain, current_price, day=None, symbol='SPY', archive_dir=ARCHIVE_DIR):
+    """Saves one chain table (see chain_table.build_chain_table) as the day's partition; a later run the same day replaces it."""
+    path = _partition_path(symbol, day or ddate.today(), archive_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    table = pa.Table.from_pandas(option_chain, preserve_index=False)
+    table = table.replace_schema_metadata({**table.schema.metadata, b'spot': str(float(current_price)).encode()})
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    options = pa.ipc.IpcWriteOptions(compression=COMPRESSION)
+    with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_archive(symbol='SPY', start=None, archive_dir=ARCHIVE_DIR):
+    """Reads every archived chain since `start` into one table with quote_date and spot columns."""
+    pattern = os.path.join(archive_dir, 'date=*', f"{symbol.replace('^', '_')}.arrow")
+    tables, days, spots = [], [], []
+    for path in sorted(glob.glob(pattern)):
+        day = pd.Timestamp(os.path.basename(os.path.dirname(path))[len('date='):])
+        if start is not None and day < pd.Timestamp(start):
+            continue
+        # Memory-mapped: only the column buffers are decompressed, no intermediate read copies
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+        tables.append(table)
+        days.append(day)
+        spots.append(float(table.schema.metadata[b'spot']))
+
+    if not tables:
+        return None
+    sizes = [t.num_rows for t in tables]
+    chains = pa.concat_tables(tables).to_pandas()
+    chains['quote_date'] = np.repeat(np.array(days, dtype='datetime64[ns]'), sizes)
+    chains['spot'] = np.repeat(spots, sizes)
+    return chains
+
+
+def daily_options_metrics(chains):
+    """Per-day averages across expirations of the put/call ratios and skew metrics shown in the Options tab."""
+    # One bucket per (quote day, expiration), summed with bincount instead of a groupby on both keys
+    day_codes, days = pd.factorize(chains['quote_date'], sort=True)
+    n_exp = len(chains['expiry'].cat.categories)
+    group = day_codes * n_exp + chains['expiry'].cat.codes.to_numpy()
+    size = len(days) * n_exp
+    per_expiry, present = grouped_options_metrics(chains, chains['spot'].to_numpy(), group, size)
+
+    # Average over the expirations quoted that day (NaN-skipping, like the live page)
+    daily = {name: pd.DataFrame(np.where(present, values, np.nan).reshape(len(days), n_exp)).mean(axis=1).to_numpy()
+             for name, values in per_expiry.items() if name in HISTORY_COLUMNS}
+    return pd.DataFrame(daily, index=pd.DatetimeIndex(days, name='Date'))[HISTORY_COLUMNS]
+
+
+def daily_surface_summary(chains):
+    """Per-day skew summary (see vol_surface.surface_summary) of the archived chains, one surface fit per day."""
+    rows = {}
+    for day, chain in chains.groupby('quote_date', sort=True):
+        _, _, metrics = fit_surface(chain, chain['spot'].iloc[0], today=day.date())
+        rows[day] = surface_summary(metrics)
+    return pd.DataFrame.from_dict(rows, orient='index', columns=SUMMARY_COLUMNS).rename_axis('Date')
+
+
+def load_options_history(symbol='SPY', start=None, archive_dir=ARCHIVE_DIR):
+    """Daily PCR / skew series and surface skew summaries rebuilt from the archive (empty when nothing is archived yet)."""
+    chains = load_archive(symbol, start, archive_dir)
+    if chains is None:
+        return pd.DataFrame(columns=HISTORY_COLUMNS + SUMMARY_COLUMNS, index=pd.DatetimeIndex([], name='Date'), dtype=float)
+    return daily_options_metrics(chains).join(daily_surface_summary(chains))
@@ -0,0 +1,58 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Fetch settings for one option-chain refresh
+MAX_WORKERS = 8         # Expirations requested at the same time
+REQUEST_TIMEOUT = 10.0  # Seconds before a single request is abandoned
+MAX_RETRIES = 2         # Extra attempts after the first failure / timeout
+BACKOFF_BASE = 0.5      # Seconds; doubles after every failed attempt
+
+
+async def _call_with_retries(loop, pool, semaphore, fn, arg, timeout, retries, backoff):
+    for attempt in range(retries + 1):
+        try:
+            async with semaphore:
+                return await asyncio.wait_for(loop.run_in_executor(pool, fn, arg), timeout)
+        except Exception as exc:
+            # asyncio.TimeoutError included; the abandoned thread finishes in the background
+            logger.warning("Request %r failed (attempt %d/%d): %r", arg, attempt + 1, retries + 1, exc)
+            if attempt < retries:
+                await asyncio.sleep(backoff * 2 ** attempt)
+    return None
+
+
+async def _fetch_all(fn, args, max_workers, timeout, retries, backoff):
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_workers)
+    # Spare threads so abandoned (timed-out) calls don't starve the retries
+    pool = ThreadPoolExecutor(max_workers=max_workers * 2)
+    try:
+        tasks = [_call_with_retries(loop, pool, semaphore, fn, arg, timeout, retries, backoff) for arg in args]
+        return await asyncio.gather(*tasks)
+    finally:
+        # Don't block on abandoned calls that are still running
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_concurrently(fn, args, max_workers=MAX_WORKERS, timeout=REQUEST_TIMEOUT,
+                       retries=MAX_RETRIES, backoff=BACKOFF_BASE):
+    """Calls fn(arg) for every arg in parallel; failed calls come back as None."""
+    return asyncio.run(_fetch_all(fn, list(args), max_workers, timeout, retries, backoff))
+
+
+def fetch_option_chains(option_chain, dates, **kwargs):
+    """Fetches the chain of every expiration in parallel, skipping expirations that keep failing."""
+    results = fetch_concurrently(option_chain, dates, **kwargs)
+    chains = []
+    for date, opt in zip(dates, results):
+        if opt is None:
+            continue
+        chains.append({
+            'date': date,
+            'calls': opt.calls,
+            'puts': opt.puts
+        })
+    return chains
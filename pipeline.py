@@ -0,0 +1,271 @@
+import time
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from datetime import datetime as dt
+from indicator_engine import label_scores, default_indicators, compute_indicators, SENTIMENT_DTYPE
+from episodes import transition_durations
+from regime_analytics import regime_analytics
+from event_study import event_study
+from vol_surface import vol_surface
+from positioning import dealer_positioning
+
+# ==========================================
+# Sentiment Pipeline
+# ==========================================
+  # every calculation behind the dashboard, free of Streamlit
+  # run_pipeline() returns the snapshot the page renders
+
+# Overall sentiment label; per-indicator thresholds live on the indicator classes
+
+overall_threshold = [76,56,45,25]
+
+# --- Calendar Alignment ---
+  # every indicator score is put on one master trading-day calendar (the days SPY traded) before averaging;
+  # a score missing on a master day carries its last value for at most FFILL_LIMIT days, then drops out
+
+MASTER_TICKER = 'SPY'
+FFILL_LIMIT = 3             # Master trading days a stale score may be carried forward
+SCORE_WEIGHTS = {}          # Indicator name -> weight in the overall score; unlisted indicators weigh 1
+
+def master_calendar(closes, ticker=MASTER_TICKER):
+    return closes.index[closes[ticker].notna()]
+
+def align_scores(frames, indicators, calendar, ffill_limit=FFILL_LIMIT):
+    """Scores of every indicator on `calendar` ({name}_score columns) and the mask of days each one is available."""
+    scores = pd.DataFrame({
+        f'{ind.name}_score': frames[ind.name][ind.score_column].dropna().reindex(calendar, method='ffill', limit=ffill_limit)
+        for ind in indicators
+    }, index=calendar)
+    return scores, scores.notna()
+
+def weighted_mean(scores, available, weights):
+    """Row-wise weighted mean over the available scores, and the share of the total weight that was available.
+
+    Weights are renormalized over the scores present each day; a day with none is NaN.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    mask = np.asarray(available)
+    present = mask @ weights
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(mask, np.asarray(scores), 0.0) @ weights / present
+    return np.where(present > 0, mean, np.nan), present / weights.sum()
+
+# --- Indicator Scores ---
+
+def combine_scores(frames, indicators, calendar, weights=None, ffill_limit=FFILL_LIMIT):
+    # --- Combine and Average Scores ---
+    weights = {**SCORE_WEIGHTS, **(weights or {})}
+    scores, available = align_scores(frames, indicators, calendar, ffill_limit)
+    # Start at the first day any indicator has warmed up
+    started = available.any(axis=1).cummax()
+    scores, available = scores[started], available[started]
+
+    combined_sentiment_df = scores
+    # Weighted average across the registered indicators available that day
+    combined_sentiment_df['overall_average_sentiment'], combined_sentiment_df['overall_coverage'] = weighted_mean(
+        scores, available, [weights.get(ind.name, 1.0) for ind in indicators])
+    # Categorize based on user-defined ranges
+    combined_sentiment_df['overall_label'] = label_scores(combined_sentiment_df['overall_average_sentiment'].to_numpy(), overall_threshold)
+    return combined_sentiment_df, available
+
+# --- Research Appendix ---
+
+# Every analysis takes the aligned combined_sentiment_df and the master ticker's close on the same calendar
+
+CORR_WINDOWS = [20, 60, 120, 252]
+# A window's variance term at or below this fraction of n times its running sum of squares is round-off: the series is constant there
+CORR_EPS = 1e-12
+
+def rolling_correlation(x, y, windows=CORR_WINDOWS):
+    """Trailing correlation of x and y over every window, from one set of prefix sums of x, y, x², y² and xy.
+
+    A window with a missing value in either series, or where either series is constant, is NaN.
+    """
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    valid = np.isfinite(x) & np.isfinite(y)
+    # Centred first so the running sums stay small and their differences keep their precision
+    x = np.where(valid, x - x[valid].mean(), 0.0) if valid.any() else np.zeros(len(x))
+    y = np.where(valid, y - y[valid].mean(), 0.0) if valid.any() else np.zeros(len(y))
+    sums = np.zeros((6, len(x) + 1))
+    np.cumsum(np.stack([valid, x, y, x * x, y * y, x * y]), axis=1, out=sums[:, 1:])
+
+    out = {}
+    for window in windows:
+        n, sx, sy, sxx, syy, sxy = np.full((6, len(x)), np.nan)
+        scale_x, scale_y = np.full((2, len(x)), np.nan)
+        if len(x) >= window:
+            pad = np.full((6, window - 1), np.nan)
+            n, sx, sy, sxx, syy, sxy = np.concatenate([pad, sums[:, window:] - sums[:, :-window]], axis=1)
+            # Round-off of a windowed sum grows with the running sum it is taken from
+            scale_x, scale_y = np.concatenate([pad[:2], sums[3:5, window:]], axis=1)
+        var_x, var_y = n * sxx - sx * sx, n * syy - sy * sy
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = (n * sxy - sx * sy) / np.sqrt(var_x * var_y)
+        flat = (var_x <= CORR_EPS * n * scale_x) | (var_y <= CORR_EPS * n * scale_y)
+        corr[flat | ~(n == window)] = np.nan
+        out[window] = np.clip(corr, -1, 1)
+    return out
+
+def analyze_standardized_correlation(combined_sentiment_df, close, indicators, windows=CORR_WINDOWS):
+    df = combined_sentiment_df[['overall_average_sentiment']].assign(Close=close).dropna()
+
+    df['sentiment_pct'] = df['overall_average_sentiment'].pct_change()
+    df['spy_pct'] = df['Close'].pct_change()
+    df.dropna(inplace=True)
+
+    # Z-Score Standardization
+    df['sentiment_z'] = (df['sentiment_pct'] - df['sentiment_pct'].mean()) / df['sentiment_pct'].std()
+    df['spy_z'] = (df['spy_pct'] - df['spy_pct'].mean()) / df['spy_pct'].std()
+    columns = ['sentiment_z', 'spy_z']
+    for window, corr in rolling_correlation(df['sentiment_z'], df['spy_z'], windows).items():
+        df[f'rolling_corr_{window}'] = corr
+        columns.append(f'rolling_corr_{window}')
+
+    # Each indicator against SPY; daily score changes, since % changes of a 0-100 percentile blow up near 0
+    for ind in indicators:
+        change = combined_sentiment_df[f'{ind.name}_score'].diff().reindex(df.index)
+        for window, corr in rolling_correlation(change, df['spy_pct'], windows).items():
+            df[f'{ind.name}_corr_{window}'] = corr
+            columns.append(f'{ind.name}_corr_{window}')
+    return df[columns]
+
+HORIZONS = {'1-Month': 21, '3-Months': 63, '6-Months': 126, '12-Months': 252} # Trading day approximations
+LABEL_ORDER = list(SENTIMENT_DTYPE.categories)
+
+def forward_return_matrix(close, periods):
+    """Forward returns (%) over each of `periods` trading days: one row per day, one column per period, NaN past the end."""
+    close = np.asarray(close, dtype=np.float64)
+    longest = max(periods)
+    # windows[t, k] is the close k days after t, a strided view over the NaN-padded series
+    windows = sliding_window_view(np.concatenate([close, np.full(longest, np.nan)]), longest + 1)[:len(close)]
+    return (windows[:, periods] / windows[:, :1] - 1) * 100
+
+def forward_return_summary(combined_sentiment_df, close, horizons=HORIZONS):
+    """Box-plot statistics of the forward returns per sentiment label and horizon, and the returns beyond the whiskers."""
+    forward = forward_return_matrix(close, list(horizons.values()))
+    codes = combined_sentiment_df['overall_label'].cat.codes.to_numpy()
+
+    rows, outliers = [], []
+    for code, label in enumerate(LABEL_ORDER):
+        in_label = forward[codes == code]
+        for j, horizon in enumerate(horizons):
+            returns = in_label[:, j]
+            returns = returns[~np.isnan(returns)]
+            if not len(returns):
+                continue
+            q1, median, q3 = np.percentile(returns, [25, 50, 75])
+            # Whiskers end at the most extreme returns within 1.5 IQR of the box, as in Plotly
+            iqr = q3 - q1
+            inside = returns[(returns >= q1 - 1.5 * iqr) & (returns <= q3 + 1.5 * iqr)]
+            lower, upper = inside.min(), inside.max()
+            rows.append({'Label': label, 'Horizon': horizon, 'count': len(returns), 'mean': returns.mean(),
+                         'q1': q1, 'median': median, 'q3': q3, 'lowerfence': lower, 'upperfence': upper})
+            beyond = returns[(returns < lower) | (returns > upper)]
+            outliers.append(pd.DataFrame({'Label': label, 'Horizon': horizon, 'Return': beyond}))
+
+    summary = pd.DataFrame(rows, columns=['Label', 'Horizon', 'count', 'mean', 'q1', 'median', 'q3', 'lowerfence', 'upperfence'])
+    outliers = pd.concat(outliers, ignore_index=True) if outliers else pd.DataFrame(columns=['Label', 'Horizon', 'Return'])
+    for df in (summary, outliers):
+        df['Label'] = df['Label'].astype(SENTIMENT_DTYPE)
+    return summary, outliers
+
+# --- Options Activity ---
+
+ATM_WIN, OTM_PCT = 0.01, 0.10 # 1% ATM window, +-10% OTM window
+
+EXPIRY_COLUMNS = ['date', 'DTE', 'v_pcr', 'oi_pcr', 'atm_iv', 'otm_put_iv', 'otm_call_iv', 'tail', 'put_conv', 'call_fomo']
+
+def grouped_options_metrics(option_chain, spot, group, n_groups):
+    """Put/call ratios, bucket IVs and skew ratios of every group of contracts, from one bincount per sum.
+
+    `group` holds an integer group code per contract and `spot` a scalar or per-contract spot price.
+    Returns a dict of length-n_groups arrays and a mask of the groups that have any contract.
+    """
+    def bucket_sum(mask, values):
+        return np.bincount(group[mask], weights=values[mask], minlength=n_groups)
+
+    calls = (option_chain['type'] == 'call').to_numpy()
+    puts = ~calls
+    present = np.bincount(group, minlength=n_groups) > 0
+
+    # [SentimentScore_PutCall_Ratio.py] 0 when no calls traded
+    volume = option_chain['volume'].to_numpy(dtype=np.float64)
+    oi = option_chain['oi'].to_numpy(dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v_call, oi_call = bucket_sum(calls, volume), bucket_sum(calls, oi)
+        metrics = {
+            'v_pcr': np.where(v_call > 0, bucket_sum(puts, volume) / v_call, 0),
+            'oi_pcr': np.where(oi_call > 0, bucket_sum(puts, oi) / oi_call, 0),
+        }
+
+        # [SentimentScore_VolatilitySkew.py] mean IV of the ATM, OTM put and OTM call buckets; NaN when a bucket is empty
+        iv = option_chain['iv'].to_numpy(dtype=np.float64)
+        moneyness = option_chain['strike'].to_numpy(dtype=np.float64) / spot
+        quoted = iv > 0
+
+        def bucket_mean(mask):
+            mask = mask & quoted
+            return bucket_sum(mask, iv) / np.bincount(group[mask], minlength=n_groups)
+
+        metrics['atm_iv'] = bucket_mean((moneyness > 1 - ATM_WIN) & (moneyness < 1 + ATM_WIN))
+        metrics['otm_put_iv'] = bucket_mean(puts & (moneyness < 1 - OTM_PCT))
+        metrics['otm_call_iv'] = bucket_mean(calls & (moneyness > 1 + OTM_PCT))
+        # Tail-skew, Put Convexity and Call-FOMO
+        metrics['tail'] = metrics['otm_put_iv'] / metrics['otm_call_iv']
+        metrics['put_conv'] = metrics['otm_put_iv'] / metrics['atm_iv']
+        metrics['call_fomo'] = metrics['otm_call_iv'] / metrics['atm_iv']
+    return metrics, present
+
+
+def options_analytics(option_chain, current_price):
+    """Tidy per-expiry PCR / IV / skew frame, nearest expiration first."""
+    expiry = option_chain['expiry'].cat
+    codes = expiry.codes.to_numpy().astype(np.int64)
+    metrics, present = grouped_options_metrics(option_chain, current_price, codes, len(expiry.categories))
+    dates = expiry.categories[present]
+    dte = (pd.to_datetime(dates) - pd.Timestamp(dt.now().date())).days
+    expiry_df = pd.DataFrame({'date': dates, 'DTE': dte, **{name: values[present] for name, values in metrics.items()}},
+                             columns=EXPIRY_COLUMNS)
+    return expiry_df
+
+# --- Full Pipeline ---
+
+def run_pipeline(closes, option_chain, current_price, indicators=None, frames=None, weights=None):
+    """Runs every calculation behind the dashboard and returns the snapshot dict it renders.
+
+    `closes` holds one column of closing prices per ticker; indicators default to the full registry.
+    Indicator `frames` already extended incrementally (see indicator_engine.IndicatorStream) are used as is.
+    `weights` overrides SCORE_WEIGHTS for the overall score.
+    """
+    indicators = indicators or default_indicators()
+    frames = frames or compute_indicators(closes, indicators)
+    # Aligned once on the master calendar, then shared by every appendix analysis
+    combined_sentiment_df, availability = combine_scores(frames, indicators, master_calendar(closes), weights)
+    close = closes[MASTER_TICKER].reindex(combined_sentiment_df.index)
+    # Every (from, to) label episode, in one pass over the label series
+    transitions = transition_durations(combined_sentiment_df['overall_label'], combined_sentiment_df.index)
+    forward_summary, forward_outliers = forward_return_summary(combined_sentiment_df, close)
+    expiry_metrics = options_analytics(option_chain, current_price)
+    # Fitted IV surface, cached per chain snapshot
+    surface, surface_metrics = vol_surface(option_chain, current_price)
+
+    return {
+        **frames,
+        'combined_sentiment_df': combined_sentiment_df,
+        'score_availability': availability,
+        'correlation': analyze_standardized_correlation(combined_sentiment_df, close, indicators),
+        'transitions': transitions,
+        **regime_analytics(combined_sentiment_df['overall_label']),
+        'event_study': event_study(combined_sentiment_df['overall_label'], closes),
+        'forward_summary': forward_summary,
+        'forward_outliers': forward_outliers,
+        'expiry_metrics': expiry_metrics,
+        'vol_surface': surface,
+        'surface_metrics': surface_metrics,
+        **dealer_positioning(option_chain, current_price),
+        'current_price': float(current_price),
+        'as_of': f"{combined_sentiment_df.index.max():%Y-%m-%d}",
+        'options_as_of': f"{dt.now():%Y-%m-%d %H:%M}",
+        'created_at': time.time(),
+    }
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+from implied_vol import RISK_FREE_RATE, DIVIDEND_YIELD, bs_gamma, expiry_years
+
+# Dealer positioning implied by open interest, across every fetched expiration
+  # gamma exposure (GEX) assumes customers are net call sellers and put buyers, so dealers on the other side are
+  # long call gamma and short put gamma: call gamma counts positive, put gamma negative,
+  # in dollars of delta change per 1% move of the underlying;
+  # per-strike sums are np.bincount over the strike codes of the flattened chain arrays
+CONTRACT_SIZE = 100
+LEVEL_RANGE = 0.15          # Hypothetical spot levels scanned for the zero-gamma level, +-15% around spot
+N_LEVELS = 121
+LEVEL_CHUNK = 16            # Levels evaluated per pass, to bound the contracts x levels temporaries
+
+PROFILE_COLUMNS = ['strike', 'call_gex', 'put_gex', 'net_gex', 'call_oi', 'put_oi']
+
+
+def _contract_arrays(option_chain, today=None):
+    # Strike, time to expiry, IV, open interest and GEX sign (+1 call, -1 put) of every contract with open interest;
+    # contracts without an IV still count towards max pain, their gamma is 0
+    expiry = option_chain['expiry'].cat
+    t = expiry_years(expiry.categories, today)[expiry.codes.to_numpy()]
+    strike = option_chain['strike'].to_numpy(dtype=np.float64)
+    iv = option_chain['iv'].to_numpy(dtype=np.float64)
+    oi = option_chain['oi'].to_numpy(dtype=np.float64)
+    sign = np.where((option_chain['type'] == 'call').to_numpy(), 1.0, -1.0)
+    use = oi > 0
+    return strike[use], t[use], iv[use], oi[use], sign[use]
+
+
+def gamma_exposure(spot, strike, t, iv, oi, sign, rate=RISK_FREE_RATE, dividend_yield=DIVIDEND_YIELD):
+    """Dollar gamma per 1% move of every contract's open interest at `spot`, signed for dealers (element-wise)."""
+    gamma = np.nan_to_num(bs_gamma(spot, strike, t, iv, rate, dividend_yield))
+    return sign * gamma * oi * CONTRACT_SIZE * spot ** 2 * 0.01
+
+
+def max_pain(strikes, call_oi, put_oi):
+    """Strike at which the options expiring there would pay their holders the least (NaN without open interest).
+
+    Payout at every candidate strike K_j from cumulative sums over the sorted strikes:
+    calls pay sum_{K_i < K_j} call_oi_i * (K_j - K_i), puts pay sum_{K_i > K_j} put_oi_i * (K_i - K_j).
+    """
+    if not len(strikes) or call_oi.sum() + put_oi.sum() == 0:
+        return np.nan
+    call_pay = strikes * np.cumsum(call_oi) - np.cumsum(call_oi * strikes)
+    put_pay = np.cumsum((put_oi * strikes)[::-1])[::-1] - strikes * np.cumsum(put_oi[::-1])[::-1]
+    return float(strikes[np.argmin(call_pay + put_pay)])
+
+
+def zero_gamma_level(spot, strike, t, iv, oi, sign, rate=RISK_FREE_RATE, dividend_yield=DIVIDEND_YIELD):
+    """Spot level closest to `spot` at which the total dealer GEX changes sign (NaN if it keeps one sign within LEVEL_RANGE)."""
+    levels = spot * np.linspace(1 - LEVEL_RANGE, 1 + LEVEL_RANGE, N_LEVELS)
+    total = np.concatenate([
+        gamma_exposure(chunk[:, None], strike, t, iv, oi, sign, rate, dividend_yield).sum(axis=1)
+        for chunk in np.array_split(levels, -(-N_LEVELS // LEVEL_CHUNK))
+    ])
+    crossing = np.flatnonzero(np.sign(total[:-1]) * np.sign(total[1:]) < 0)
+    if not len(crossing):
+        return np.nan
+    i = crossing[np.argmin(np.abs(levels[crossing] - spot))]
+    # Linear interpolation between the two levels around the sign change
+    return float(levels[i] - total[i] * (levels[i + 1] - levels[i]) / (total[i + 1] - total[i]))
+
+
+def dealer_positioning(option_chain, spot, rate=RISK_FREE_RATE, dividend_yield=DIVIDEND_YIELD, today=None):
+    """Snapshot entries: per-strike GEX / OI profile, net GEX at spot, zero-gamma level and max-pain strike."""
+    strike, t, iv, oi, sign = _contract_arrays(option_chain, today)
+    strikes, codes = np.unique(strike, return_inverse=True)
+    calls = sign > 0
+    gex = gamma_exposure(spot, strike, t, iv, oi, sign, rate, dividend_yield)
+
+    def strike_sum(mask, values):
+        return np.bincount(codes[mask], weights=values[mask], minlength=len(strikes))
+
+    profile = pd.DataFrame({
+        'strike': strikes,
+        'call_gex': strike_sum(calls, gex),
+        'put_gex': strike_sum(~calls, gex),
+        'net_gex': np.bincount(codes, weights=gex, minlength=len(strikes)),
+        'call_oi': strike_sum(calls, oi),
+        'put_oi': strike_sum(~calls, oi),
+    }, columns=PROFILE_COLUMNS)
+    return {
+        'gex_profile': profile,
+        'net_gex': float(gex.sum()),
+        'zero_gamma': zero_gamma_level(spot, strike, t, iv, oi, sign, rate, dividend_yield),
+        'max_pain': max_pain(strikes, profile['call_oi'].to_numpy(), profile['put_oi'].to_numpy()),
+    }
@@ -0,0 +1,100 @@
+import os
+import pandas as pd
+from providers import get_provider
+
+# Local price history, one Parquet file per ticker
+STORE_DIR = os.environ.get(
+    'PRICE_STORE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'prices')
+)
+
+FULL_PERIOD = '10y'     # Period pulled on a cold store or after a detected adjustment
+LOOKBACK_YEARS = 10     # History handed back to the dashboard
+OVERLAP_BARS = 5        # Stored bars re-fetched on every update to detect splits / adjustments
+ADJ_TOLERANCE = 1e-4    # Relative Close difference that counts as an adjustment change
+
+
+def _store_path(ticker):
+    # '^VIX' -> '_VIX.parquet'
+    return os.path.join(STORE_DIR, f"{ticker.replace('^', '_')}.parquet")
+
+
+def load_prices(ticker):
+    """Reads the stored history of a ticker, or None if nothing is stored yet."""
+    path = _store_path(ticker)
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path)
+
+
+def save_prices(ticker, df):
+    """Writes the full history of a ticker, replacing the partition atomically."""
+    os.makedirs(STORE_DIR, exist_ok=True)
+    path = _store_path(ticker)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _download(tickers, **kwargs):
+    # One batched request for every ticker, split back into per-ticker frames
+    raw = get_provider().download(tickers, **kwargs)
+    frames = {}
+    for ticker in tickers:
+        df = raw.xs(ticker, axis=1, level='Ticker').dropna(how='all')
+        df.columns.name = None
+        frames[ticker] = df
+    return frames
+
+
+def _adjustment_changed(stored, fresh):
+    # Adjusted closes on overlapping bars move after a split or dividend re-adjustment
+    overlap = stored.index.intersection(fresh.index)
+    if overlap.empty:
+        return True
+    # The last stored bar may be a partial intraday bar whose close is finalized later; only settled bars count
+    settled = overlap[overlap < stored.index[-1]]
+    old = stored.loc[settled, 'Close']
+    new = fresh.loc[settled, 'Close']
+    return bool(((new - old).abs() > ADJ_TOLERANCE * old.abs()).any())
+
+
+def update_prices(tickers):
+    """Brings the stored histories up to date, fetching only bars after the last stored date."""
+    stored = {t: load_prices(t) for t in tickers}
+    cold = [t for t, df in stored.items() if df is None or len(df) < OVERLAP_BARS]
+    warm = [t for t in tickers if t not in cold]
+    result = {}
+
+    if warm:
+        # Single incremental request starting from the oldest overlap among stored tickers
+        start = min(stored[t].index[-OVERLAP_BARS] for t in warm)
+        fresh = _download(warm, start=start.strftime('%Y-%m-%d'))
+        for t in warm:
+            old, new = stored[t], fresh[t]
+            if new.empty:
+                result[t] = old
+            elif _adjustment_changed(old, new):
+                # Whole history was re-adjusted upstream, so the stored bars are stale
+                cold.append(t)
+            else:
+                # Overlapping bars are replaced so a partial intraday bar gets finalized
+                result[t] = pd.concat([old[old.index < new.index[0]], new[old.columns]])
+                save_prices(t, result[t])
+
+    if cold:
+        full = _download(cold, period=FULL_PERIOD)
+        for t in cold:
+            result[t] = full[t]
+            save_prices(t, full[t])
+
+    return {t: result[t] for t in tickers}
+
+
+def load_panel(tickers, years=LOOKBACK_YEARS):
+    """Returns one date-aligned (Price, Ticker) panel with the last `years` of history."""
+    frames = update_prices(tickers)
+    panel = pd.concat(frames, axis=1, names=['Ticker', 'Price'])
+    panel = panel.swaplevel(axis=1).sort_index(axis=1)
+    start = panel.index.max() - pd.DateOffset(years=years)
+    return panel.loc[panel.index >= start]
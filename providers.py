@@ -0,0 +1,181 @@
+import os
+import sys
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import namedtuple
+import pandas as pd
+import yfinance as yf
+
+# Market data backends
+  # MARKET_DATA_PROVIDER selects the backend: 'yfinance' (default) or 'replay'
+  # REPLAY_DIR / REPLAY_LATENCY configure the replay backend
+PROVIDER_ENV = 'MARKET_DATA_PROVIDER'
+REPLAY_DIR = os.environ.get(
+    'REPLAY_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'replay')
+)
+REPLAY_LATENCY = float(os.environ.get('REPLAY_LATENCY', 0))
+
+OptionChain = namedtuple('OptionChain', ['calls', 'puts'])
+
+
+class DataProvider(ABC):
+    """Interface shared by every market data backend."""
+
+    @abstractmethod
+    def download(self, tickers, period=None, start=None, end=None):
+        # Adjusted daily bars with (Price, Ticker) columns, like yf.download(auto_adjust=True)
+        ...
+
+    @abstractmethod
+    def option_expirations(self, symbol):
+        # Listed expirations as 'YYYY-MM-DD' strings, nearest first
+        ...
+
+    @abstractmethod
+    def option_chain(self, symbol, date):
+        # OptionChain(calls, puts) for one expiration
+        ...
+
+    @abstractmethod
+    def last_price(self, symbol):
+        # Latest close of the underlying
+        ...
+
+
+class YFinanceProvider(DataProvider):
+    """Live data from Yahoo Finance."""
+
+    def __init__(self):
+        # Ticker objects keep the expiration list cached between chain requests
+        self._tickers = {}
+
+    def _ticker(self, symbol):
+        if symbol not in self._tickers:
+            self._tickers[symbol] = yf.Ticker(symbol)
+        return self._tickers[symbol]
+
+    def download(self, tickers, period=None, start=None, end=None):
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        kwargs = {k: v for k, v in dict(period=period, start=start, end=end).items() if v is not None}
+        df = yf.download(tickers, auto_adjust=True, progress=False, **kwargs)
+        if not isinstance(df.columns, pd.MultiIndex):
+            df.columns = pd.MultiIndex.from_product([df.columns, tickers], names=['Price', 'Ticker'])
+        return df
+
+    def option_expirations(self, symbol):
+        return list(self._ticker(symbol).options)
+
+    def option_chain(self, symbol, date):
+        opt = self._ticker(symbol).option_chain(date)
+        return OptionChain(opt.calls, opt.puts)
+
+    def last_price(self, symbol):
+        return self._ticker(symbol).history(period="1d")['Close'].iloc[-1]
+
+
+class ReplayProvider(DataProvider):
+    """Recorded prices and option chains served from disk, with optional simulated latency.
+
+    Layout under `root`:
+      prices/<ticker>.parquet                 OHLCV bars
+      options/<symbol>/expirations.json       expirations and last price at record time
+      options/<symbol>/<date>_calls.parquet   chain per expiration
+      options/<symbol>/<date>_puts.parquet
+    """
+
+    def __init__(self, root=REPLAY_DIR, latency=REPLAY_LATENCY):
+        self.root = root
+        self.latency = latency
+
+    def _sleep(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _price_path(self, ticker):
+        return os.path.join(self.root, 'prices', f"{ticker.replace('^', '_')}.parquet")
+
+    def _options_dir(self, symbol):
+        return os.path.join(self.root, 'options', symbol.replace('^', '_'))
+
+    def download(self, tickers, period=None, start=None, end=None):
+        self._sleep()
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        frames = {t: pd.read_parquet(self._price_path(t)) for t in tickers}
+        df = pd.concat(frames, axis=1, names=['Ticker', 'Price']).swaplevel(axis=1).sort_index(axis=1)
+        if period is not None:
+            df = df.loc[df.index >= df.index.max() - _period_offset(period)]
+        if start is not None:
+            df = df.loc[df.index >= pd.Timestamp(start)]
+        if end is not None:
+            df = df.loc[df.index < pd.Timestamp(end)]
+        return df
+
+    def _meta(self, symbol):
+        with open(os.path.join(self._options_dir(symbol), 'expirations.json')) as f:
+            return json.load(f)
+
+    def option_expirations(self, symbol):
+        self._sleep()
+        return self._meta(symbol)['expirations']
+
+    def option_chain(self, symbol, date):
+        self._sleep()
+        base = os.path.join(self._options_dir(symbol), date)
+        return OptionChain(pd.read_parquet(f"{base}_calls.parquet"), pd.read_parquet(f"{base}_puts.parquet"))
+
+    def last_price(self, symbol):
+        self._sleep()
+        return self._meta(symbol)['last_price']
+
+
+def _period_offset(period):
+    # yfinance-style periods: '1d', '12mo', '5y', ...
+    for suffix, unit in (('mo', 'months'), ('y', 'years'), ('d', 'days')):
+        if period.endswith(suffix):
+            return pd.DateOffset(**{unit: int(period[:-len(suffix)])})
+    raise ValueError(f"Unsupported period: {period}")
+
+
+_provider = None
+
+def get_provider():
+    """Returns the process-wide provider selected by MARKET_DATA_PROVIDER."""
+    global _provider
+    if _provider is None:
+        name = os.environ.get(PROVIDER_ENV, 'yfinance')
+        if name == 'yfinance':
+            _provider = YFinanceProvider()
+        elif name == 'replay':
+            _provider = ReplayProvider()
+        else:
+            raise ValueError(f"Unknown {PROVIDER_ENV}: {name}")
+    return _provider
+
+
+def record(root, tickers, symbol='SPY', n_expirations=14, period='10y', source=None):
+    """Captures prices and option chains from `source` (live by default) into a replay directory."""
+    source = source or YFinanceProvider()
+    replay = ReplayProvider(root)
+
+    os.makedirs(os.path.join(root, 'prices'), exist_ok=True)
+    data = source.download(tickers, period=period)
+    for t in tickers:
+        data.xs(t, axis=1, level='Ticker').dropna(how='all').to_parquet(replay._price_path(t))
+
+    options_dir = replay._options_dir(symbol)
+    os.makedirs(options_dir, exist_ok=True)
+    dates = source.option_expirations(symbol)[:n_expirations]
+    for date in dates:
+        opt = source.option_chain(symbol, date)
+        opt.calls.to_parquet(os.path.join(options_dir, f"{date}_calls.parquet"))
+        opt.puts.to_parquet(os.path.join(options_dir, f"{date}_puts.parquet"))
+    with open(os.path.join(options_dir, 'expirations.json'), 'w') as f:
+        json.dump({'expirations': dates, 'last_price': float(source.last_price(symbol))}, f)
+
+
+if __name__ == '__main__':
+    # python providers.py [replay_dir] -- records the dashboard's tickers for offline runs
+    from data_loader import PANEL_TICKERS
+    record(sys.argv[1] if len(sys.argv) > 1 else REPLAY_DIR, PANEL_TICKERS)
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+from indicator_engine import SENTIMENT_DTYPE
+from episodes import STATES, label_runs
+
+# Sentiment regime dynamics
+  # the overall label as a Markov chain over the five states, from integer label codes:
+  # transition counts are one np.bincount over (from, to) pair codes, dwell times are run lengths,
+  # rolling matrices come from a running sum of one-hot pair codes
+STEPS = [1, 5, 21]          # Transition horizons in trading days (day, week, month)
+ROLLING_WINDOW = 252        # Trading days of transitions behind each rolling matrix
+
+K = len(STATES)
+
+
+def label_codes(labels):
+    return np.asarray(pd.Categorical(labels, dtype=SENTIMENT_DTYPE).codes)
+
+
+def _pair_codes(codes, step):
+    # from * K + to for every labeled (t, t + step) pair, -1 where either day is unlabeled
+    start, end = codes[:-step], codes[step:]
+    return np.where((start >= 0) & (end >= 0), start * K + end, -1)
+
+
+def transition_counts(codes, step=1):
+    """K x K counts of moves from each state (rows) to each state (columns) `step` days later."""
+    pairs = _pair_codes(codes, step)
+    return np.bincount(pairs[pairs >= 0], minlength=K * K).reshape(K, K)
+
+
+def transition_matrix(codes, step=1):
+    """Row-normalized transition_counts: empirical P(state in `step` days | state today); NaN rows for unseen states."""
+    counts = transition_counts(codes, step)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return counts / counts.sum(axis=1, keepdims=True)
+
+
+def stationary_distribution(matrix):
+    """Long-run share of days in each state implied by a transition matrix (0 for states never visited)."""
+    seen = ~np.isnan(matrix).any(axis=1)
+    P = matrix[np.ix_(seen, seen)]
+    out = np.zeros(K)
+    if not seen.any():
+        return out
+    # Left eigenvector for the eigenvalue closest to 1
+    values, vectors = np.linalg.eig(P.T)
+    v = np.real(vectors[:, np.argmin(np.abs(values - 1))])
+    out[seen] = v / v.sum()
+    return out
+
+
+def dwell_times(codes):
+    """Length in trading days of every run of each state; the last labeled run, still open at the end, is flagged Censored."""
+    starts, lengths, values = label_runs(codes)
+    labeled = values >= 0
+    censored = np.zeros(len(starts), dtype=bool)
+    # Trailing unlabeled days don't close the last labeled run
+    censored[np.flatnonzero(labeled)[-1:]] = True
+    return pd.DataFrame({
+        'State': pd.Categorical.from_codes(values[labeled], dtype=SENTIMENT_DTYPE),
+        'Days': lengths[labeled],
+        'Censored': censored[labeled],
+    })
+
+
+def rolling_transition_matrices(codes, dates, window=ROLLING_WINDOW, step=1):
+    """Transition matrix over the trailing `window` days of moves, for every day: one 'From → To' column per pair."""
+    pairs = _pair_codes(codes, step)
+    # Running count of each pair code, differenced over the window
+    one_hot = np.zeros((len(pairs) + 1, K * K), dtype=np.int32)
+    one_hot[np.flatnonzero(pairs >= 0) + 1, pairs[pairs >= 0]] = 1
+    totals = np.cumsum(one_hot, axis=0)
+    counts = np.full((len(codes), K * K), np.nan)
+    if len(pairs) >= window:
+        # Row i covers moves ending on days i - window + 1 .. i
+        counts[step + window - 1:] = totals[window:] - totals[:-window]
+    counts = counts.reshape(-1, K, K)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        probabilities = counts / counts.sum(axis=2, keepdims=True)
+    columns = [f'{a} → {b}' for a in STATES for b in STATES]
+    return pd.DataFrame(probabilities.reshape(len(codes), K * K), index=dates, columns=columns)
+
+
+def regime_analytics(labels, steps=STEPS, window=ROLLING_WINDOW):
+    """Snapshot frames: transition matrices per step (long), stationary distribution, dwell times, rolling daily matrix."""
+    codes = label_codes(labels)
+    matrices = []
+    for step in steps:
+        counts = transition_counts(codes, step)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            probabilities = counts / counts.sum(axis=1, keepdims=True)
+        matrices.append(pd.DataFrame({
+            'Step': step,
+            'From': pd.Categorical(np.repeat(STATES, K), dtype=SENTIMENT_DTYPE),
+            'To': pd.Categorical(np.tile(STATES, K), dtype=SENTIMENT_DTYPE),
+            'Count': counts.ravel(),
+            'Probability': probabilities.ravel(),
+        }))
+    stationary = stationary_distribution(transition_matrix(codes, 1))
+    return {
+        'regime_transitions': pd.concat(matrices, ignore_index=True),
+        'regime_stationary': pd.DataFrame({'State': pd.Categorical(STATES, dtype=SENTIMENT_DTYPE), 'Probability': stationary}),
+        'regime_dwell': dwell_times(codes),
+        'regime_rolling': rolling_transition_matrices(codes, labels.index, window),
+    }
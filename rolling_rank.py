@@ -0,0 +1,105 @@
+import numpy as np
+
+# Rolling percentile-rank kernel
+  # same results as pandas Series.rolling(window, min_periods).rank(method, pct=True)
+  # values are compressed to integer ranks and stored in a wavelet matrix (one bit level per rank bit);
+  # "how many values in the window are smaller" is then answered for every window at once,
+  # level by level, in O(log n) vectorized NumPy steps instead of a per-row Python loop
+METHODS = ('average', 'min', 'max')
+
+
+def _build_levels(codes, bits):
+    # Per bit level, from the most significant: prefix counts of 0-bits and the number of 0-bits
+    levels = []
+    current = codes
+    for b in range(bits - 1, -1, -1):
+        one = (current & (1 << b)) != 0
+        zeros = np.zeros(len(current) + 1, dtype=np.int32)
+        np.cumsum(~one, dtype=np.int32, out=zeros[1:])
+        levels.append((zeros, zeros[-1]))
+        # Stable partition for the next level: 0-bits first, then 1-bits
+        current = np.concatenate((current[np.flatnonzero(~one)], current[np.flatnonzero(one)]))
+    return levels
+
+
+def _count_less(levels, bits, lo, hi, values):
+    # Number of codes < values[i] at positions [lo[i], hi[i])
+    count = np.zeros(len(values), dtype=np.int32)
+    for (zeros, n_zeros), b in zip(levels, range(bits - 1, -1, -1)):
+        z_lo, z_hi = zeros[lo], zeros[hi]
+        one = (values >> b) & 1
+        # A 1-bit in the query means every 0-bit value in the range is smaller
+        count += one * (z_hi - z_lo)
+        lo = z_lo + one * (n_zeros + lo - 2 * z_lo)
+        hi = z_hi + one * (n_zeros + hi - 2 * z_hi)
+    return count
+
+
+def rolling_rank(x, window, min_periods=None, method='average', pct=True):
+    """Rolling rank of each value within its trailing `window`, column by column for 2-D input.
+
+    Matches pandas rolling().rank(): NaNs are skipped inside a window, a window with fewer than
+    `min_periods` (default `window`) values or a NaN current value gives NaN, and ties follow `method`.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}, got '{method}'")
+    min_periods = window if min_periods is None else min_periods
+    if min_periods > window:
+        raise ValueError(f"min_periods {min_periods} must be <= window {window}")
+    x = np.asarray(x, dtype=np.float64)
+    one_dim = x.ndim == 1
+    x = x.reshape(len(x), 1) if one_dim else x
+    n_rows, n_cols = x.shape
+    out = np.full((n_cols, n_rows), np.nan)
+    if out.size == 0:
+        return out.T[:, 0] if one_dim else out.T
+
+    # Columns laid end to end; a window never crosses into the previous column
+    flat = x.T.ravel()
+    n = len(flat)
+    positions = np.arange(n, dtype=np.int32)
+
+    # Dense integer ranks (NaNs sort last, so they are never counted as smaller)
+    order = np.argsort(flat, kind='stable')
+    ordered = flat[order]
+    new_value = np.empty(n, dtype=bool)
+    new_value[0] = True
+    np.not_equal(ordered[1:], ordered[:-1], out=new_value[1:])
+    new_value[1:] &= ~(np.isnan(ordered[1:]) & np.isnan(ordered[:-1]))
+    ranks = np.empty(n, dtype=np.int32)
+    ranks[order] = np.cumsum(new_value) - 1
+
+    # Window bounds [lo, hi) and non-NaN counts of every row
+    t = np.tile(np.arange(n_rows, dtype=np.int32), n_cols)
+    lo = positions - t + np.maximum(t - window + 1, 0)
+    hi = positions + 1
+    valid = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(~np.isnan(flat), out=valid[1:])
+    nobs = valid[hi] - valid[lo]
+
+    keep = ~np.isnan(flat) & (nobs >= max(min_periods, 1))
+    lo, hi, value = lo[keep], hi[keep], ranks[keep]
+    bits = max(int(ranks.max()).bit_length(), 1)
+    less = _count_less(_build_levels(ranks, bits), bits, lo, hi, value)
+
+    # Ties: equal ranks sit next to each other in `order`, sorted by position,
+    # so the ones inside the window are found with two binary searches
+    if new_value.all():
+        equal = np.ones(len(value), dtype=np.int32)
+    else:
+        keys = ranks[order].astype(np.int64) * n + order
+        first_equal = np.searchsorted(keys, value.astype(np.int64) * n + lo)
+        equal = np.searchsorted(keys, value.astype(np.int64) * n + hi - 1, side='right') - first_equal
+
+    if method == 'average':
+        rank = less + (equal + 1) / 2
+    elif method == 'min':
+        rank = (less + 1).astype(np.float64)
+    else:
+        rank = (less + equal).astype(np.float64)
+    if pct:
+        rank = rank / nobs[keep]
+
+    result = out.ravel()
+    result[keep] = rank
+    return result if one_dim else out.T
@@ -0,0 +1,69 @@
+import os
+import json
+import shutil
+import pandas as pd
+from datetime import datetime as dt
+
+# Versioned, ready-to-render pipeline snapshots
+  # <SNAPSHOT_DIR>/<last bar>-<created>/  one Parquet file per frame + meta.json for scalars
+  # <SNAPSHOT_DIR>/LATEST                 name of the newest complete snapshot
+SNAPSHOT_DIR = os.environ.get(
+    'SNAPSHOT_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'snapshots')
+)
+KEEP_SNAPSHOTS = 10
+
+
+def write_snapshot(results, snapshot_dir=SNAPSHOT_DIR):
+    """Writes a pipeline result dict as a new snapshot version and points LATEST at it."""
+    version = f"{results['as_of'].replace('-', '')}-{dt.now():%Y%m%dT%H%M%S}"
+    path = os.path.join(snapshot_dir, version)
+    tmp_path = f"{path}.tmp"
+    os.makedirs(tmp_path, exist_ok=True)
+
+    meta = {'version': version, 'frames': []}
+    for key, value in results.items():
+        if isinstance(value, pd.DataFrame):
+            value.to_parquet(os.path.join(tmp_path, f"{key}.parquet"))
+            meta['frames'].append(key)
+        else:
+            meta[key] = value
+    with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+
+    # Readers only ever see complete snapshots
+    os.replace(tmp_path, path)
+    pointer = os.path.join(snapshot_dir, 'LATEST')
+    with open(f"{pointer}.tmp", 'w') as f:
+        f.write(version)
+    os.replace(f"{pointer}.tmp", pointer)
+
+    _prune(snapshot_dir)
+    return version
+
+
+def _prune(snapshot_dir):
+    versions = sorted(d for d in os.listdir(snapshot_dir)
+                      if os.path.isdir(os.path.join(snapshot_dir, d)) and not d.endswith('.tmp'))
+    for old in versions[:-KEEP_SNAPSHOTS]:
+        shutil.rmtree(os.path.join(snapshot_dir, old), ignore_errors=True)
+
+
+def latest_version(snapshot_dir=SNAPSHOT_DIR):
+    """Name of the newest snapshot, or None if the worker hasn't written one yet."""
+    try:
+        with open(os.path.join(snapshot_dir, 'LATEST')) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def load_snapshot(version, snapshot_dir=SNAPSHOT_DIR):
+    """Reads one snapshot back into the dict produced by pipeline.run_pipeline."""
+    path = os.path.join(snapshot_dir, version)
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+    results = {k: v for k, v in meta.items() if k not in ('frames',)}
+    for key in meta['frames']:
+        results[key] = pd.read_parquet(os.path.join(path, f"{key}.parquet"))
+    return results
@@ -0,0 +1,156 @@
+import os
+import itertools
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from rolling_rank import rolling_rank
+from indicator_engine import get_indicator, default_indicators, label_scores
+from pipeline import (HORIZONS, MASTER_TICKER, SCORE_WEIGHTS, overall_threshold,
+                      master_calendar, align_scores, weighted_mean, forward_return_matrix)
+from episodes import transition_durations
+
+# ==========================================
+# Parameter Sensitivity Sweep
+# ==========================================
+  # re-runs the aggregate score and the research-appendix statistics over a grid of indicator windows
+  # and overall label thresholds, to show how much the conclusions depend on the default choices
+  # every variant of an indicator is scored in one batch: their signals are stacked and ranked by a
+  # single 2-D rolling_rank call per rank window; grid cells then run on a process pool
+PARAM_GRID = {
+    'spy': {'ma_window': [100, 125, 150, 200], 'rank_window': [252, 365]},
+    'vix': {'ma_window': [20, 50, 100], 'rank_window': [126, 252]},
+    'sh': {'return_window': [10, 20, 40], 'rank_window': [126, 252]},
+    'gv': {'return_window': [126, 252], 'rank_window': [126, 252]},
+}
+THRESHOLD_GRID = [[80,60,40,20], overall_threshold, [70,55,45,30]]
+MAX_WORKERS = int(os.environ.get('SWEEP_WORKERS', os.cpu_count() or 1))
+
+METRICS = ['label_agreement', 'latest_score', 'median_recovery_days'] + [f'{h}_fear_premium' for h in HORIZONS]
+
+# Results of earlier sweeps, per input data and parameter tuple; only the latest input data is kept
+_variant_cache = {}
+_cell_cache = {}
+
+
+def _evict_stale(data_key):
+    # The worker's prices change on every run, so entries for any other data would only accumulate
+    for key in [k for k in _variant_cache if k[0] != data_key]:
+        del _variant_cache[key]
+    for key in [k for k in _cell_cache if k[0][0] != data_key]:
+        del _cell_cache[key]
+
+
+def _variants(name, grid):
+    # Every parameter combination of one indicator as sorted (param, value) tuples, the defaults first
+    defaults = get_indicator(name).params
+    keys = sorted(grid)
+    variants = [tuple(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+    default = tuple((k, defaults[k]) for k in keys)
+    return [default] + [v for v in variants if v != default]
+
+
+def variant_scores(closes, name, variants, calendar, data_key=None):
+    """Scores of every parameter variant of one indicator, aligned on `calendar`, as {variant: array}."""
+    missing = [v for v in variants if (data_key, name, v) not in _variant_cache]
+    indicators = {v: get_indicator(name, **dict(v)) for v in missing}
+    if missing:
+        index, prices = indicators[missing[0]].price_arrays(closes)
+        # Signals sharing a rank window and the same kept rows are ranked together
+        groups = {}
+        for v, indicator in indicators.items():
+            rows, columns = indicator.signal_arrays(prices)
+            key = (indicator.params['rank_window'], None if rows is None else rows.tobytes())
+            groups.setdefault(key, []).append((v, rows, columns[indicator.rank_column]))
+
+        for (rank_window, _), members in groups.items():
+            percentiles = rolling_rank(np.column_stack([signal for _, _, signal in members]), rank_window) * 100
+            for (v, rows, _), percentile in zip(members, percentiles.T):
+                indicator = indicators[v]
+                score = indicator.score_arrays(percentile)[indicator.score_column]
+                frame = pd.DataFrame({indicator.score_column: score}, index=index if rows is None else index[rows])
+                aligned, _ = align_scores({name: frame}, [indicator], calendar)
+                _variant_cache[(data_key, name, v)] = aligned.iloc[:, 0].to_numpy()
+    return {v: _variant_cache[(data_key, name, v)] for v in variants}
+
+
+# --- Grid Cells ---
+  # pool workers receive the variant scores and forward returns once, in their initializer
+_inputs = {}
+
+def _init_worker(inputs):
+    _inputs.update(inputs)
+
+def _cell_metrics(cell):
+    choice, thresholds = cell[:-1], list(cell[-1])
+    scores = np.column_stack([_inputs['scores'][name][v] for name, v in zip(_inputs['names'], choice)])
+    overall, _ = weighted_mean(scores, ~np.isnan(scores), _inputs['weights'])
+    labels = label_scores(overall, thresholds)
+    codes = labels.codes
+    labeled = codes >= 0
+
+    baseline = _inputs['baseline_codes']
+    both = labeled & (baseline >= 0)
+    metrics = {
+        # Share of days with the same label as the dashboard's default parameters
+        'label_agreement': (codes[both] == baseline[both]).mean() if both.any() else np.nan,
+        'latest_score': overall[-1],
+        'median_recovery_days': transition_durations(
+            labels, _inputs['calendar'], pairs=[('Extreme Fear', 'Neutral')])['Days'].median(),
+    }
+    # Mean forward return after Fear / Extreme Fear days minus after Greed / Extreme Greed days
+    fear, greed = labeled & (codes <= 1), labeled & (codes >= 3)
+    for h, forward in _inputs['forward'].items():
+        valid = ~np.isnan(forward)
+        f, g = forward[fear & valid], forward[greed & valid]
+        metrics[f'{h}_fear_premium'] = f.mean() - g.mean() if len(f) and len(g) else np.nan
+    return metrics
+
+
+# --- Sweep ---
+
+def run_sweep(closes, grid=PARAM_GRID, threshold_grid=THRESHOLD_GRID, weights=None, max_workers=MAX_WORKERS):
+    """Appendix statistics for every cell of the parameter grid, one row per cell.
+
+    Parameter columns are named <indicator>_<param> plus 'overall_thresholds'; metrics are METRICS.
+    Indicators not in `grid` keep their default parameters.
+    """
+    data_key = int(pd.util.hash_pandas_object(closes).sum())
+    _evict_stale(data_key)
+    calendar = master_calendar(closes)
+    indicators = default_indicators()
+    names = [ind.name for ind in indicators]
+    weights = {**SCORE_WEIGHTS, **(weights or {})}
+
+    variants = {name: _variants(name, grid.get(name, {})) for name in names}
+    scores = {name: variant_scores(closes, name, variants[name], calendar, data_key) for name in names}
+
+    matrix = forward_return_matrix(closes[MASTER_TICKER].reindex(calendar), list(HORIZONS.values()))
+    forward = {h: matrix[:, j] for j, h in enumerate(HORIZONS)}
+
+    inputs = {'names': names, 'scores': scores, 'forward': forward, 'calendar': calendar,
+              'weights': [weights.get(name, 1.0) for name in names]}
+    # Labels under the dashboard's default parameters, for label_agreement
+    baseline = np.column_stack([scores[name][variants[name][0]] for name in names])
+    inputs['baseline_codes'] = label_scores(weighted_mean(baseline, ~np.isnan(baseline), inputs['weights'])[0],
+                                            overall_threshold).codes
+
+    cells = [choice + (tuple(t),) for choice in itertools.product(*(variants[name] for name in names))
+             for t in threshold_grid]
+    cache_key = (data_key, tuple(inputs['weights']))
+    todo = [c for c in cells if (cache_key, c) not in _cell_cache]
+    if todo:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(inputs,)) as pool:
+            for cell, metrics in zip(todo, pool.map(_cell_metrics, todo, chunksize=max(len(todo) // (4 * max_workers), 1))):
+                _cell_cache[(cache_key, cell)] = metrics
+
+    rows = []
+    for cell in cells:
+        row = {f'{name}_{k}': value for name, v in zip(names, cell[:-1]) for k, value in v}
+        row['overall_thresholds'] = '/'.join(map(str, cell[-1]))
+        rows.append({**row, **_cell_cache[(cache_key, cell)]})
+    return pd.DataFrame(rows)
+
+
+def sensitivity_heatmap(table, x, y, metric):
+    """Mean of `metric` over every other parameter, with `y` values as rows and `x` values as columns."""
+    return table.pivot_table(index=y, columns=x, values=metric, aggfunc='mean')
@@ -0,0 +1,91 @@
+import time
+import logging
+import threading
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+RETRY_AFTER = 300  # Seconds before a failed background refresh is attempted again
+
+
+class StaleWhileRevalidate:
+    """Holds the last good result of `fn` and refreshes it in the background once it is older than `ttl`.
+
+    Only the very first call blocks; afterwards readers always get the current value immediately
+    while at most one worker thread recomputes it and swaps the new result in.
+    """
+
+    def __init__(self, fn, ttl, args=(), kwargs=None):
+        self.fn = fn
+        self.ttl = ttl
+        self.args = args
+        self.kwargs = kwargs or {}
+        self._entry = None          # (value, updated_at), replaced in a single assignment
+        self._load_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        self._next_attempt = 0.0
+        self._last_error = None
+
+    def _load(self):
+        value = self.fn(*self.args, **self.kwargs)
+        self._entry = (value, time.time())
+        self._last_error = None
+
+    def _refresh(self):
+        try:
+            self._load()
+        except Exception as exc:
+            logger.exception("Background refresh of %s failed", self.fn.__name__)
+            self._last_error = repr(exc)
+            self._next_attempt = time.time() + RETRY_AFTER
+        finally:
+            self._refreshing = False
+
+    def get(self):
+        if self._entry is None:
+            # Cold start: the first caller loads, concurrent callers wait for that same load
+            with self._load_lock:
+                if self._entry is None:
+                    self._load()
+
+        value, updated_at = self._entry
+        now = time.time()
+        if now - updated_at > self.ttl and now >= self._next_attempt:
+            with self._refresh_lock:
+                if not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(target=self._refresh, name=f"swr-{self.fn.__name__}", daemon=True).start()
+        return value
+
+    def status(self):
+        """Age and refresh state of the cached value, for "as of" captions."""
+        updated_at = self._entry[1] if self._entry is not None else None
+        return {
+            'updated_at': updated_at,
+            'age': time.time() - updated_at if updated_at is not None else None,
+            'refreshing': self._refreshing,
+            'last_error': self._last_error,
+        }
+
+
+def swr_cache(ttl):
+    """Decorator version, keeping one StaleWhileRevalidate entry per argument tuple."""
+    def decorator(fn):
+        entries = {}
+        entries_lock = threading.Lock()
+
+        def _entry(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            with entries_lock:
+                if key not in entries:
+                    entries[key] = StaleWhileRevalidate(fn, ttl, args, kwargs)
+                return entries[key]
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            return _entry(*args, **kwargs).get()
+
+        wrapper.status = lambda *args, **kwargs: _entry(*args, **kwargs).status()
+        return wrapper
+    return decorator
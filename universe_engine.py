@@ -0,0 +1,118 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from indicator_engine import SPYTrend, SafeHavenDemand, RealizedVolTrend, RelativeStrength, label_scores
+from pipeline import overall_threshold
+from price_store import load_panel
+
+# ==========================================
+# Universe Batch Engine
+# ==========================================
+  # the dashboard's trend, volatility, safe-haven and rotation methodology applied to every member
+  # of a universe; members are scored on a process pool reading one shared-memory close matrix
+UNIVERSES = {
+    'Indices': {'benchmark': 'SPY', 'members': ['QQQ', 'IWM', 'DIA']},
+    'Sectors': {'benchmark': 'SPY', 'members': ['XLB', 'XLC', 'XLE', 'XLF', 'XLI', 'XLK', 'XLP', 'XLRE', 'XLU', 'XLV', 'XLY']},
+    'Countries': {'benchmark': 'ACWI', 'members': ['EWJ', 'EWU', 'EWG', 'EWC', 'EWA', 'EWZ', 'FXI', 'INDA']},
+}
+SAFE_HAVEN = 'IEF'
+FIELDS = ['trend', 'volatility', 'safe_haven', 'rotation']
+MAX_WORKERS = int(os.environ.get('UNIVERSE_WORKERS', os.cpu_count() or 1))
+
+
+def member_indicators(member, benchmark):
+    """One indicator per field for a universe member, with the dashboard's default parameters."""
+    return {
+        'trend': SPYTrend(ticker=member),                           # vs its 125-day MA
+        'volatility': RealizedVolTrend(ticker=member),              # realized vol in place of the VIX
+        'safe_haven': SafeHavenDemand(ticker=member, bond=SAFE_HAVEN),
+        'rotation': RelativeStrength(ticker=member, benchmark=benchmark),  # in place of growth vs value
+    }
+
+
+def universe_tickers(universes=UNIVERSES):
+    tickers = [SAFE_HAVEN]
+    for spec in universes.values():
+        tickers += [t for t in [spec['benchmark']] + spec['members'] if t not in tickers]
+    return tickers
+
+
+# --- Pool Workers ---
+  # each process attaches the shared blocks once; tasks only carry (row, member, benchmark)
+_shared = {}
+
+def _attach(name, shape):
+    shm = SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+def _init_worker(closes_spec, scores_spec, index, tickers):
+    closes_shm, closes = _attach(*closes_spec)
+    scores_shm, scores = _attach(*scores_spec)
+    # Blocks stay referenced for the life of the process
+    _shared.update(blocks=(closes_shm, scores_shm), scores=scores, index=index,
+                   closes=pd.DataFrame(closes, index=index, columns=tickers, copy=False))
+
+def _score_member(row, member, benchmark):
+    closes, index = _shared['closes'], _shared['index']
+    for j, (field, indicator) in enumerate(member_indicators(member, benchmark).items()):
+        score = indicator.compute(closes)[indicator.score_column]
+        _shared['scores'][row, j] = score.reindex(index).to_numpy()
+    return row
+
+
+# --- Batch ---
+
+def _shared_copy(array):
+    shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=np.float64, buffer=shm.buf)[:] = array
+    return shm
+
+def score_universes(closes, universes=UNIVERSES, max_workers=MAX_WORKERS):
+    """Scores every member of every universe from one frame of closes (one column per ticker).
+
+    Returns {universe: (scores, labels)}: scores has (member, field) columns with FIELDS plus 'overall'
+    (their mean), labels the overall sentiment label of each member as an ordered Categorical.
+    """
+    tasks = [(name, member, spec['benchmark']) for name, spec in universes.items() for member in spec['members']]
+    values = closes.to_numpy(dtype=np.float64)
+    shape = (len(tasks), len(FIELDS), len(closes))
+
+    closes_shm = _shared_copy(values)
+    scores_shm = _shared_copy(np.full(shape, np.nan))
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=((closes_shm.name, values.shape), (scores_shm.name, shape),
+                                           closes.index, list(closes.columns))) as pool:
+            list(pool.map(_score_member, range(len(tasks)), *zip(*[t[1:] for t in tasks])))
+        scores = np.ndarray(shape, dtype=np.float64, buffer=scores_shm.buf).copy()
+    finally:
+        for shm in (closes_shm, scores_shm):
+            shm.close()
+            shm.unlink()
+
+    results = {}
+    for name, spec in universes.items():
+        rows = [i for i, task in enumerate(tasks) if task[0] == name]
+        block = scores[rows]                                    # (member, field, date)
+        # Mean of the fields available that day (NaN until one has warmed up)
+        with np.errstate(invalid='ignore'):
+            overall = np.nansum(block, axis=1) / (~np.isnan(block)).sum(axis=1)
+        columns = pd.MultiIndex.from_product([spec['members'], FIELDS + ['overall']], names=['Member', 'Field'])
+        data = np.concatenate([block, overall[:, None]], axis=1).reshape(len(rows) * (len(FIELDS) + 1), -1).T
+        wide = pd.DataFrame(data, index=closes.index, columns=columns).dropna(how='all')
+        labels = pd.DataFrame({m: label_scores(wide[(m, 'overall')].to_numpy(), overall_threshold)
+                               for m in spec['members']}, index=wide.index)
+        results[name] = (wide, labels)
+    return results
+
+
+def run_universes(universes=UNIVERSES):
+    """Loads every universe ticker from the price store and returns the snapshot frames, keyed universe_<name>_scores / _labels."""
+    closes = load_panel(universe_tickers(universes))['Close']
+    results = {}
+    for name, (scores, labels) in score_universes(closes, universes).items():
+        results[f"universe_{name.lower()}_scores"] = scores
+        results[f"universe_{name.lower()}_labels"] = labels
+    return results
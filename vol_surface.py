@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+from datetime import date
+from scipy.special import ndtr
+from implied_vol import RISK_FREE_RATE, DIVIDEND_YIELD, expiry_years
+
+# Implied volatility surface on a regular log-moneyness x DTE grid
+  # every expiration gets a polynomial smile in k = ln(strike / forward), fitted by least squares to its
+  # out-of-the-money contracts (puts below the forward, calls above), all expirations at once from
+  # np.bincount moments; the smiles are then interpolated linearly in total variance (IV^2 * T) across
+  # expirations at fixed k, and skew metrics are read off the grid
+FIT_RANGE = 0.5             # Contracts with |k| above this are left out of the fit
+# ln(K / F) grid, 0.5% steps over the whole fit range: the 25-delta call sits near k = 0.675 IV sqrt(T) + IV^2 T / 2,
+# past +0.2 for year-plus tenors, so the wings stay on the grid wherever strikes are quoted
+LOG_MONEYNESS = np.round(np.linspace(-FIT_RANGE, FIT_RANGE, 201), 4)
+N_DTE = 25                  # Rows of the DTE grid, evenly spaced between the nearest and furthest fitted expiration
+SMILE_DEGREE = 3
+SMILE_SCALE = 0.1           # k is fitted as k / SMILE_SCALE to keep the moment matrix well conditioned
+MIN_CONTRACTS = 8           # Quoted OTM contracts an expiration needs for a smile fit
+DELTA = 0.25                # Wing delta of the risk reversal / butterfly
+CACHE_SIZE = 8
+
+SURFACE_COLUMNS = ['DTE', 'log_moneyness', 'iv']
+METRIC_COLUMNS = ['DTE', 'atm_iv', 'put_iv', 'call_iv', 'rr', 'bf']
+SUMMARY_COLUMNS = ['rr', 'bf', 'put_premium', 'call_premium', 'term_slope']
+
+# Skew alert thresholds, in vol points: name -> (summary column, percentile of the archive, default level)
+  # once the options archive holds ALERT_MIN_HISTORY days, each threshold is that percentile of the archived
+  # daily summaries, so the alerts flag days that are extreme for this underlying; before that the defaults apply
+  # the defaults are rough starting levels for an index, not a calibration:
+  #   rr: index risk reversals are normally negative (puts over calls), -3 / -6 mark a steeper than usual skew
+  #   put_premium: 25-delta puts more than 3 points over ATM mark heavy demand for crash protection
+  #   call_premium: an index call wing normally sits below ATM, so any premium over ATM flags upside chasing
+  #   term_slope: ATM IV normally rises gently with tenor; falling 1 point per 30 days is an inverted curve, rising 2 a steep one
+ALERT_MIN_HISTORY = 60
+ALERT_LEVELS = {
+    'rr_strong': ('rr', 10, -6.0),
+    'rr_moderate': ('rr', 25, -3.0),
+    'put_premium': ('put_premium', 90, 3.0),
+    'call_premium': ('call_premium', 90, 0.0),
+    'slope_low': ('term_slope', 10, -1.0),
+    'slope_high': ('term_slope', 90, 2.0),
+}
+
+# Fitted grids of earlier chains, keyed by chain snapshot
+_surface_cache = {}
+
+
+def smile_coefficients(k, iv, group, n_groups, degree=SMILE_DEGREE):
+    """Least-squares polynomial coefficients (lowest power first) of iv on k / SMILE_SCALE for every group; NaN rows for thin groups."""
+    x = k / SMILE_SCALE
+    powers = x[:, None] ** np.arange(2 * degree + 1)
+    # Normal equations of every group: sums of x^(i + j) and x^i * iv
+    moments = np.stack([np.bincount(group, weights=powers[:, j], minlength=n_groups) for j in range(2 * degree + 1)], axis=1)
+    targets = np.stack([np.bincount(group, weights=powers[:, j] * iv, minlength=n_groups) for j in range(degree + 1)], axis=1)
+    exponents = np.arange(degree + 1)
+    normal = moments[:, exponents[:, None] + exponents[None, :]]
+    coefs = np.full((n_groups, degree + 1), np.nan)
+    fitted = moments[:, 0] >= MIN_CONTRACTS
+    if fitted.any():
+        coefs[fitted] = np.einsum('gij,gj->gi', np.linalg.pinv(normal[fitted]), targets[fitted])
+    return coefs
+
+
+def _wing_vol(delta, sigma, target):
+    # IV where the call delta of each row (decreasing in k) crosses `target`, interpolated between grid points
+    below = delta <= target
+    j = np.argmax(below, axis=1)
+    rows = np.arange(len(delta))
+    crossed = below[rows, j] & (j > 0)
+    lo = np.maximum(j - 1, 0)
+    d0, d1 = delta[rows, lo], delta[rows, j]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weight = (d0 - target) / (d0 - d1)
+        out = sigma[rows, lo] + weight * (sigma[rows, j] - sigma[rows, lo])
+    return np.where(crossed & (d0 > target), out, np.nan)
+
+
+def chain_key(option_chain, spot, today, rate, dividend_yield):
+    """Cache key of one chain snapshot and the settings the surface depends on."""
+    return (int(pd.util.hash_pandas_object(option_chain, index=False).sum()),
+            tuple(option_chain['expiry'].cat.categories), float(spot), str(today), rate, dividend_yield)
+
+
+def fit_surface(option_chain, spot, rate=RISK_FREE_RATE, dividend_yield=DIVIDEND_YIELD, today=None):
+    """IV grid (DTE rows x LOG_MONEYNESS columns), its DTE values and the metric table read off it."""
+    expiry = option_chain['expiry'].cat
+    codes = expiry.codes.to_numpy().astype(np.int64)
+    t_expiry = expiry_years(expiry.categories, today)
+    forward = spot * np.exp((rate - dividend_yield) * t_expiry)
+
+    # Out-of-the-money side of every strike, where quotes are the most liquid
+    k = np.log(option_chain['strike'].to_numpy(dtype=np.float64) / forward[codes])
+    iv = option_chain['iv'].to_numpy(dtype=np.float64)
+    calls = (option_chain['type'] == 'call').to_numpy()
+    with np.errstate(invalid='ignore'):
+        use = (iv > 0) & (np.abs(k) <= FIT_RANGE) & (calls == (k >= 0))
+    coefs = smile_coefficients(k[use], iv[use], codes[use], len(expiry.categories))
+
+    # Each smile is only trusted between its lowest and highest fitted strike
+    k_min = np.full(len(t_expiry), np.inf)
+    k_max = np.full(len(t_expiry), -np.inf)
+    np.minimum.at(k_min, codes[use], k[use])
+    np.maximum.at(k_max, codes[use], k[use])
+    fitted = np.flatnonzero(~np.isnan(coefs[:, 0]))
+    fitted = fitted[np.argsort(t_expiry[fitted], kind='stable')]
+    empty = (np.empty((0, len(LOG_MONEYNESS))), np.empty(0), pd.DataFrame(columns=METRIC_COLUMNS))
+    if len(fitted) < 2:
+        return empty
+
+    smiles = np.polynomial.polynomial.polyval(LOG_MONEYNESS / SMILE_SCALE, coefs[fitted].T)
+    inside = (LOG_MONEYNESS >= k_min[fitted, None]) & (LOG_MONEYNESS <= k_max[fitted, None]) & (smiles > 0)
+    t_fit = t_expiry[fitted]
+    variance = np.where(inside, smiles ** 2 * t_fit[:, None], np.nan)
+
+    # Linear in total variance between the two expirations around every grid DTE
+    t_grid = np.linspace(t_fit[0], t_fit[-1], N_DTE)
+    hi = np.clip(np.searchsorted(t_fit, t_grid, side='right'), 1, len(t_fit) - 1)
+    lo = hi - 1
+    weight = ((t_grid - t_fit[lo]) / (t_fit[hi] - t_fit[lo]))[:, None]
+    grid_variance = variance[lo] * (1 - weight) + variance[hi] * weight
+    with np.errstate(invalid='ignore'):
+        grid = np.sqrt(grid_variance / t_grid[:, None])
+
+    # Forward call delta N(d1) of every grid point, for the wing volatilities
+    sqrt_t = np.sqrt(t_grid)[:, None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        delta = ndtr((-LOG_MONEYNESS + 0.5 * grid ** 2 * sqrt_t ** 2) / (grid * sqrt_t))
+    dte = t_grid * 365
+    atm = np.array([np.interp(0, LOG_MONEYNESS, row, left=np.nan, right=np.nan) for row in grid])
+    put_iv = _wing_vol(delta, grid, 1 - DELTA)
+    call_iv = _wing_vol(delta, grid, DELTA)
+    metrics = pd.DataFrame({
+        'DTE': dte, 'atm_iv': atm, 'put_iv': put_iv, 'call_iv': call_iv,
+        # Risk reversal (call wing minus put wing, negative when puts are bid) and butterfly (wing premium over ATM)
+        'rr': call_iv - put_iv, 'bf': (call_iv + put_iv) / 2 - atm,
+    })
+    return grid, dte, metrics
+
+
+def vol_surface(option_chain, spot, rate=RISK_FREE_RATE, dividend_yield=DIVIDEND_YIELD, today=None):
+    """Snapshot frames of the fitted surface: long (DTE, log_moneyness, iv) grid and the per-DTE metric table; cached per chain."""
+    today = today or date.today()
+    key = chain_key(option_chain, spot, today, rate, dividend_yield)
+    if key not in _surface_cache:
+        grid, dte, metrics = fit_surface(option_chain, spot, rate, dividend_yield, today)
+        surface = pd.DataFrame({
+            'DTE': np.repeat(dte, len(LOG_MONEYNESS)),
+            'log_moneyness': np.tile(LOG_MONEYNESS, len(dte)),
+            'iv': grid.ravel(),
+        }, columns=SURFACE_COLUMNS)
+        if len(_surface_cache) >= CACHE_SIZE:
+            _surface_cache.pop(next(iter(_surface_cache)))
+        _surface_cache[key] = (surface, metrics)
+    return _surface_cache[key]
+
+
+def term_slope(metrics, days=30):
+    """Change in ATM IV per `days` between the nearest and furthest grid DTE with an ATM value (NaN with fewer than two)."""
+    atm = metrics.dropna(subset=['atm_iv'])
+    if len(atm) < 2:
+        return np.nan
+    return (atm['atm_iv'].iloc[-1] - atm['atm_iv'].iloc[0]) / (atm['DTE'].iloc[-1] - atm['DTE'].iloc[0]) * days
+
+
+def surface_summary(metrics):
+    """Averages across the DTE grid, in vol points, of the skew values the alerts read."""
+    metrics = metrics.astype(float)
+    return {
+        'rr': metrics['rr'].mean() * 100,
+        'bf': metrics['bf'].mean() * 100,
+        'put_premium': (metrics['put_iv'] - metrics['atm_iv']).mean() * 100,
+        'call_premium': (metrics['call_iv'] - metrics['atm_iv']).mean() * 100,
+        'term_slope': term_slope(metrics) * 100,
+    }
+
+
+def alert_levels(history=None):
+    """Skew alert thresholds: percentiles of the archived daily summaries, or the ALERT_LEVELS defaults while the archive is short."""
+    levels = {}
+    for name, (column, percentile, default) in ALERT_LEVELS.items():
+        values = history[column].dropna() if history is not None and column in history else []
+        levels[name] = float(np.percentile(values, percentile)) if len(values) >= ALERT_MIN_HISTORY else default
+    return levels
@@ -0,0 +1,133 @@
+import copy
+import time
+import logging
+from datetime import datetime, timedelta, time as dtime
+from zoneinfo import ZoneInfo
+from data_loader import fetch_price_panel, fetch_options_data, build_snapshot
+from snapshot import write_snapshot, latest_version, load_snapshot
+from options_archive import archive_chain
+from indicator_engine import IndicatorStream, default_indicators
+from universe_engine import run_universes
+from sweep import run_sweep
+from bootstrap import bootstrap_key, regime_bootstrap
+from pipeline import MASTER_TICKER
+
+# Background ingestion and precompute worker
+  # fetches prices and option chains, archives the day's chain, runs the full pipeline and writes a snapshot
+  # indicator scores are extended bar by bar from the rolling state saved in the previous snapshot
+  # index, sector and country universes, the parameter sensitivity grid and the regime bootstrap run on process pools
+  # the dashboard then only reads snapshots; run with `python worker.py`
+logger = logging.getLogger('worker')
+
+MARKET_TZ = ZoneInfo('America/New_York')
+MARKET_OPEN, MARKET_CLOSE = dtime(9, 30), dtime(16, 0)
+CLOSE_DELAY = timedelta(minutes=20)       # Lets the closing bar settle before the end-of-day run
+INTRADAY_INTERVAL = timedelta(hours=2)    # Refresh cadence while the market is open
+POLL_INTERVAL = 60                        # Seconds between schedule checks
+
+
+def is_market_open(now):
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def last_close(now):
+    """Most recent weekday close (plus settle delay) at or before `now`."""
+    day = now.date()
+    while True:
+        close = datetime.combine(day, MARKET_CLOSE, tzinfo=MARKET_TZ) + CLOSE_DELAY
+        if day.weekday() < 5 and close <= now:
+            return close
+        day -= timedelta(days=1)
+
+
+def is_due(now, last_run):
+    # Every INTRADAY_INTERVAL during the session, then once after each close
+    if last_run is None:
+        return True
+    if is_market_open(now):
+        return now - last_run >= INTRADAY_INTERVAL
+    return last_run < last_close(now)
+
+
+def _indicator_signature(indicators):
+    return [(i.name, i.params, i.thresholds) for i in indicators]
+
+
+def update_indicator_frames(closes, previous=None, open_bar=False):
+    """Indicator frames for `closes` and the stream that produced them.
+
+    Resumes from the `previous` snapshot's state when it still matches the registry and the stored
+    prices; otherwise (first run, adjusted history, changed indicators) replays the full history.
+    With `open_bar`, the last bar of `closes` is a partial session: the stream only advances through the
+    completed sessions, and the open bar is scored on a copy so its changing close never reaches the state.
+    """
+    settled = closes.iloc[:-1] if open_bar else closes
+    stream, frames = None, None
+    if previous is not None and 'indicator_state' in previous:
+        stream = IndicatorStream.from_state(previous['indicator_state'])
+        if (_indicator_signature(stream.indicators) == _indicator_signature(default_indicators())
+                and stream.is_consistent(settled)):
+            # Rows past the saved state belong to the previous run's open bar
+            frames = {i.name: previous[i.name][previous[i.name].index <= stream.last_date] for i in stream.indicators}
+        else:
+            stream = None
+    if stream is None:
+        logger.info("Replaying indicator state over the full history")
+        stream = IndicatorStream()
+    frames = stream.extend(settled, frames)
+    if open_bar:
+        frames = copy.deepcopy(stream).extend(closes, frames)
+    # Keep the same span as the price panel
+    return {name: df[df.index >= closes.index[0]] for name, df in frames.items()}, stream
+
+
+def update_bootstrap(results, closes, previous=None):
+    """Regime bootstrap for the new snapshot, reused from the previous one when its inputs are unchanged."""
+    combined = results['combined_sentiment_df']
+    close = closes[MASTER_TICKER].reindex(combined.index)
+    key = bootstrap_key(combined, close)
+    if previous is not None and previous.get('bootstrap_key') == key:
+        return {'bootstrap': previous['bootstrap'], 'bootstrap_key': key}
+    return {'bootstrap': regime_bootstrap(combined, close), 'bootstrap_key': key}
+
+
+def run_once():
+    option_data = fetch_options_data('SPY')
+    # Later runs the same day overwrite the partition, so the archive keeps the end-of-day chain
+    today = datetime.now(MARKET_TZ).date()
+    if today.weekday() < 5:
+        archive_chain(*option_data, day=today, symbol='SPY')
+    panel = fetch_price_panel()
+    version = latest_version()
+    previous = load_snapshot(version) if version else None
+    # During the session the last bar is today's partial one
+    now = datetime.now(MARKET_TZ)
+    open_bar = is_market_open(now) and panel.index[-1].date() == now.date()
+    frames, stream = update_indicator_frames(panel['Close'], previous, open_bar)
+    results = build_snapshot(panel, option_data, frames)
+    results['indicator_state'] = stream.to_state()
+    results.update(run_universes())
+    results['sensitivity'] = run_sweep(panel['Close'])
+    results.update(update_bootstrap(results, panel['Close'], previous))
+    version = write_snapshot(results)
+    logger.info("Wrote snapshot %s", version)
+    return results
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    last_run = None
+    while True:
+        now = datetime.now(MARKET_TZ)
+        if is_due(now, last_run):
+            try:
+                run_once()
+                last_run = now
+            except Exception:
+                # Keep serving the previous snapshot; retry on the next poll
+                logger.exception("Pipeline run failed")
+        time.sleep(POLL_INTERVAL)
+
+
+if __name__ == '__main__':
+    main()